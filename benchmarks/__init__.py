@@ -0,0 +1 @@
+"""Benchmarks for the Control4 integration."""
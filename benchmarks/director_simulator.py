@@ -0,0 +1,505 @@
+"""Local stand-in for a Control4 director.
+
+Serves the REST endpoints pyControl4 uses from a synthetic project, keeps a
+mutable model of the room and light variables that commands change, pushes
+the changes over the director socket.io endpoint, and can inject latency,
+failures, slow responses and expired tokens.
+
+Run it on its own and point a config entry at the printed host:
+
+    python -m benchmarks.director_simulator --rooms 200 --latency 0.05
+
+or start a DirectorSimulator from a benchmark.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import json
+import logging
+import os
+import random
+import ssl
+import tempfile
+from time import monotonic
+from typing import Any
+
+from aiohttp import web
+import socketio
+from socketio import packet
+
+from .fixtures import Project, generate_project
+
+_LOGGER = logging.getLogger(__name__)
+
+EXPIRED_TOKEN_RESPONSE = {
+    "error": "Unauthorized",
+    "details": "Expired or invalid token",
+}
+FAILURE_RESPONSE = {"error": "Internal Server Error", "details": "Simulated failure"}
+
+
+def self_signed_ssl_context(host: str = "localhost") -> ssl.SSLContext:
+    """Return a server SSL context with a throwaway self-signed certificate.
+
+    The integration does not verify the director certificate, just like
+    with a real controller.
+    """
+    # pylint: disable=import-outside-toplevel
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host)])
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=30))
+        .sign(key, hashes.SHA256())
+    )
+
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    with tempfile.TemporaryDirectory() as directory:
+        certfile = os.path.join(directory, "director.crt")
+        keyfile = os.path.join(directory, "director.key")
+        with open(certfile, "wb") as file:
+            file.write(certificate.public_bytes(serialization.Encoding.PEM))
+        with open(keyfile, "wb") as file:
+            file.write(
+                key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.NoEncryption(),
+                )
+            )
+        context.load_cert_chain(certfile, keyfile)
+    return context
+
+
+class DirectorSimulator:
+    """Serves a synthetic project over the director REST API.
+
+    Every request first waits latency plus up to jitter seconds. A
+    slow_rate share of requests waits slow_latency instead, and an
+    error_rate share fails with a director error. A token is rejected as
+    expired token_lifetime seconds after it was first used, and all tokens
+    in use can be expired at once with expire_tokens.
+
+    Like a director, the socket.io endpoint sends each client an ID to ask
+    for a subscription with, then pushes the variables that change, by
+    command or set_variable, as events named after the subscription.
+    """
+
+    def __init__(
+        self,
+        project: Project,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 5.0,
+        token_lifetime: float | None = None,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the simulator."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.token_lifetime = token_lifetime
+        self.requests: Counter[str] = Counter()
+        self.commands: Counter[str] = Counter()
+
+        self._project = project
+        self._random = random.Random(seed)
+        self._items = {item["id"]: item for item in project.items}
+        self._children: dict[int, list[int]] = {}
+        for item in project.items:
+            if "parentId" in item:
+                self._children.setdefault(item["parentId"], []).append(item["id"])
+        self._variables: dict[int, dict[str, Any]] = {}
+        for variable in project.variables:
+            self._variables.setdefault(variable["id"], {})[
+                variable["varName"]
+            ] = variable["value"]
+        self._tokens: dict[str, float] = {}
+        self._expired_tokens: set[str] = set()
+        self._ramps: dict[int, asyncio.TimerHandle] = {}
+        self._seq = 0
+        # Subscription IDs of the connected socket.io clients
+        self._subscriptions: dict[str, str] = {}
+        self._pushes: set[asyncio.Task[None]] = set()
+        self._sio = socketio.AsyncServer(async_mode="aiohttp", always_connect=True)
+        self._sio.on("connect", self._async_on_socket_connect)
+        self._sio.on("startSubscription", self._async_on_start_subscription)
+        self._sio.on("disconnect", self._async_on_socket_disconnect)
+
+        self.app = web.Application(middlewares=[self._fault_middleware])
+        self.app.router.add_get("/api/v1/items", self._get_items)
+        self.app.router.add_get("/api/v1/items/variables", self._get_all_variables)
+        self.app.router.add_get("/api/v1/items/datatoui", self._get_subscription)
+        self.app.router.add_get(r"/api/v1/items/{item_id:\d+}", self._get_item)
+        self.app.router.add_get(
+            r"/api/v1/items/{item_id:\d+}/variables", self._get_item_variables
+        )
+        self.app.router.add_post(
+            r"/api/v1/items/{item_id:\d+}/commands", self._post_command
+        )
+        self.app.router.add_get("/api/v1/categories/{category}", self._get_category)
+        self.app.router.add_get(
+            "/api/v1/agents/ui_configuration", self._get_ui_configuration
+        )
+        self._sio.attach(self.app)
+        self._runner: web.AppRunner | None = None
+
+    async def async_start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> str:
+        """Start serving and return the host:port to configure."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(
+            self._runner,
+            host,
+            port,
+            ssl_context=ssl_context or self_signed_ssl_context(),
+        )
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        return f"{bound_host}:{bound_port}"
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        for handle in self._ramps.values():
+            handle.cancel()
+        self._ramps.clear()
+        for sid in set(self._subscriptions.values()):
+            await self._sio.disconnect(sid)
+        for task in self._pushes:
+            task.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def expire_tokens(self) -> None:
+        """Reject every token used so far as expired."""
+        self._expired_tokens.update(self._tokens)
+
+    def variables(self, item_id: int) -> dict[str, Any]:
+        """Return the current variables of an item."""
+        return self._variables.get(item_id, {})
+
+    def set_variable(self, item_id: int, var_name: str, value: Any) -> None:
+        """Change a variable outside Home Assistant, as a keypad would."""
+        self._set_variables(item_id, {var_name: value})
+
+    @web.middleware
+    async def _fault_middleware(self, request: web.Request, handler) -> web.Response:
+        """Apply latency, failures and token expiry before handling a request."""
+        self.requests[request.method + " " + self._route_name(request)] += 1
+        if self._random.random() < self.slow_rate:
+            await asyncio.sleep(self.slow_latency)
+        elif self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+        # The socket.io handshake and subscription pass the token as JWT
+        token = (
+            request.headers.get("Authorization", "").removeprefix("Bearer ")
+            or request.headers.get("JWT")
+            or request.query.get("JWT", "")
+        )
+        first_used = self._tokens.setdefault(token, monotonic())
+        if token in self._expired_tokens or (
+            self.token_lifetime is not None
+            and monotonic() - first_used > self.token_lifetime
+        ):
+            return web.json_response(EXPIRED_TOKEN_RESPONSE, status=401)
+        if self._random.random() < self.error_rate:
+            return web.json_response(FAILURE_RESPONSE, status=500)
+        return await handler(request)
+
+    @staticmethod
+    def _route_name(request: web.Request) -> str:
+        """Return the route of a request without item IDs."""
+        if (resource := request.match_info.route.resource) is None:
+            return request.path
+        return resource.canonical
+
+    async def _get_items(self, request: web.Request) -> web.Response:
+        return web.json_response(self._project.items)
+
+    async def _get_item(self, request: web.Request) -> web.Response:
+        item_id = int(request.match_info["item_id"])
+        if item_id not in self._items:
+            return web.json_response([])
+        return web.json_response([self._items[item_id]])
+
+    async def _get_category(self, request: web.Request) -> web.Response:
+        category = request.match_info["category"]
+        return web.json_response(
+            [
+                item
+                for item in self._project.items
+                if category in item.get("categories", ())
+            ]
+        )
+
+    async def _get_ui_configuration(self, request: web.Request) -> web.Response:
+        return web.json_response(self._project.ui_configuration)
+
+    async def _get_all_variables(self, request: web.Request) -> web.Response:
+        var_names = set(request.query.get("varnames", "").split(","))
+        return web.json_response(
+            [
+                {"id": item_id, "varName": var_name, "value": value}
+                for item_id, variables in self._variables.items()
+                for var_name, value in variables.items()
+                if var_name in var_names
+            ]
+        )
+
+    async def _get_item_variables(self, request: web.Request) -> web.Response:
+        item_id = int(request.match_info["item_id"])
+        var_names = request.query.get("varnames")
+        wanted = set(var_names.split(",")) if var_names else None
+        return web.json_response(
+            [
+                {"id": item_id, "varName": var_name, "value": value}
+                for var_name, value in self.variables(item_id).items()
+                if wanted is None or var_name in wanted
+            ]
+        )
+
+    async def _get_subscription(self, request: web.Request) -> web.Response:
+        client_id = request.query["SubscriptionClient"]
+        return web.json_response({"subscriptionId": f"subscription-{client_id}"})
+
+    async def _async_on_socket_connect(
+        self, sid: str, _environ: dict[str, Any]
+    ) -> None:
+        await self._async_emit(sid, "clientId", sid)
+
+    async def _async_on_start_subscription(
+        self, sid: str, subscription_id: str
+    ) -> None:
+        self._subscriptions[subscription_id] = sid
+
+    async def _async_on_socket_disconnect(self, sid: str) -> None:
+        for subscription_id, subscribed_sid in list(self._subscriptions.items()):
+            if subscribed_sid == sid:
+                del self._subscriptions[subscription_id]
+
+    async def _post_command(self, request: web.Request) -> web.Response:
+        item_id = int(request.match_info["item_id"])
+        body = await request.json()
+        command = body["command"]
+        params = body.get("tParams") or {}
+        self.commands[command] += 1
+        if item_id not in self._items or not self._apply_command(
+            item_id, command, params
+        ):
+            return web.json_response(
+                {"error": "Bad Request", "details": f"Unsupported command {command}"},
+                status=400,
+            )
+        self._seq += 1
+        return web.json_response({"seq": self._seq, "result": 1})
+
+    def _set_variables(self, item_id: int, changes: dict[str, Any]) -> None:
+        """Update variables of an item and push the changed ones."""
+        variables = self._variables.setdefault(item_id, {})
+        events = [
+            # The director pushes values as strings, objects as JSON
+            {
+                "iddevice": item_id,
+                "varName": var_name,
+                "value": value if isinstance(value, str) else json.dumps(value),
+            }
+            for var_name, value in changes.items()
+            if var_name not in variables or variables[var_name] != value
+        ]
+        variables.update(changes)
+        if events and self._subscriptions:
+            task = asyncio.get_running_loop().create_task(self._async_push(events))
+            self._pushes.add(task)
+            task.add_done_callback(self._pushes.discard)
+
+    async def _async_push(self, events: list[dict[str, Any]]) -> None:
+        """Send variable change events to every subscribed client."""
+        for subscription_id, sid in list(self._subscriptions.items()):
+            await self._async_emit(sid, subscription_id, events)
+
+    async def _async_emit(self, sid: str, event: str, data: Any) -> None:
+        """Send an event to one client.
+
+        AsyncServer.emit of python-socketio 4 hands coroutines to
+        asyncio.wait, which Python 3.11 rejects, so the packet is sent
+        through engine.io directly.
+        """
+        event_packet = packet.Packet(packet.EVENT, data=[event, data])
+        await self._sio.eio.send(sid, event_packet.encode())
+
+    def _apply_command(self, item_id: int, command: str, params: dict) -> bool:
+        """Update the device model for a command, return False if unsupported."""
+        variables = self._variables.get(item_id, {})
+        if command in ("SET_LEVEL", "RAMP_TO_LEVEL"):
+            if handle := self._ramps.pop(item_id, None):
+                handle.cancel()
+            level = int(params["LEVEL"])
+            ramp_time = int(params.get("TIME", 0)) / 1000
+            if ramp_time:
+                self._ramps[item_id] = asyncio.get_running_loop().call_later(
+                    ramp_time, self._set_light_level, item_id, level
+                )
+            else:
+                self._set_light_level(item_id, level)
+        elif command == "ROOM_OFF":
+            self._set_variables(
+                item_id,
+                {"POWER_STATE": 0, "CURRENT_VIDEO_DEVICE": 0, "CURRENT MEDIA INFO": {}},
+            )
+        elif command in ("SELECT_AUDIO_DEVICE", "SELECT_VIDEO_DEVICE"):
+            device_id = int(params["deviceid"])
+            device = self._items.get(device_id, {})
+            self._set_variables(
+                item_id,
+                {
+                    "POWER_STATE": 1,
+                    "CURRENT_VIDEO_DEVICE": (
+                        device_id if command == "SELECT_VIDEO_DEVICE" else 0
+                    ),
+                    "CURRENT MEDIA INFO": {
+                        "mediainfo": {
+                            "title": device.get("name", ""),
+                            "medSrcDev": device_id,
+                        }
+                    },
+                },
+            )
+            self._set_playback(device_id, "PLAYING")
+        elif command == "SET_VOLUME_LEVEL":
+            self._set_variables(
+                item_id, {"CURRENT_VOLUME": max(0, min(100, int(params["LEVEL"])))}
+            )
+        elif command in ("PULSE_VOL_UP", "PULSE_VOL_DOWN"):
+            step = 1 if command == "PULSE_VOL_UP" else -1
+            self._set_variables(
+                item_id,
+                {
+                    "CURRENT_VOLUME": max(
+                        0, min(100, variables.get("CURRENT_VOLUME", 0) + step)
+                    )
+                },
+            )
+        elif command in ("MUTE_ON", "MUTE_OFF", "MUTE_TOGGLE"):
+            muted = variables.get("IS_MUTED", 0)
+            self._set_variables(
+                item_id,
+                {
+                    "IS_MUTED": {
+                        "MUTE_ON": 1,
+                        "MUTE_OFF": 0,
+                        "MUTE_TOGGLE": int(not muted),
+                    }[command]
+                },
+            )
+        elif command in ("PLAY", "PAUSE", "STOP"):
+            media_info = variables.get("CURRENT MEDIA INFO", {}).get("mediainfo", {})
+            if device_id := media_info.get("medSrcDev"):
+                self._set_playback(
+                    device_id,
+                    {"PLAY": "PLAYING", "PAUSE": "PAUSED", "STOP": "STOPPED"}[command],
+                )
+        else:
+            return False
+        return True
+
+    def _set_light_level(self, item_id: int, level: int) -> None:
+        """Set a dimmer level or switch state."""
+        self._ramps.pop(item_id, None)
+        changes: dict[str, Any] = {"LIGHT_STATE": int(level > 0)}
+        if "LIGHT_LEVEL" in self.variables(item_id):
+            changes["LIGHT_LEVEL"] = level
+        self._set_variables(item_id, changes)
+
+    def _set_playback(self, device_id: int, state: str) -> None:
+        """Set the playback state on a source or the child reporting it."""
+        for item_id in (device_id, *self._children.get(device_id, ())):
+            if "PLAYING" in self.variables(item_id):
+                self._set_variables(
+                    item_id,
+                    {
+                        name: int(name == state)
+                        for name in ("PLAYING", "PAUSED", "STOPPED")
+                    },
+                )
+                return
+
+
+async def _async_serve(args: argparse.Namespace) -> None:
+    """Serve a generated project until interrupted."""
+    project = generate_project(args.rooms, args.seed)
+    simulator = DirectorSimulator(
+        project,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        token_lifetime=args.token_lifetime,
+        seed=args.seed,
+    )
+    address = await simulator.async_start(args.host, args.port)
+    _LOGGER.info(
+        "Serving %s items in %s rooms on https://%s",
+        len(project.items),
+        args.rooms,
+        address,
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.async_stop()
+        _LOGGER.info("Requests: %s", dict(simulator.requests))
+        _LOGGER.info("Commands: %s", dict(simulator.commands))
+
+
+def main() -> None:
+    """Parse the command line and run the simulator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0-1")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="0-1")
+    parser.add_argument("--slow-latency", type=float, default=5.0, help="seconds")
+    parser.add_argument("--token-lifetime", type=float, help="seconds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        asyncio.run(_async_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Synthetic Control4 projects for benchmarking the integration.
+
+The generated projects mimic the shape of real director payloads: rooms on
+floors, dimmer and switch loads with their proxies, per room audio and video
+sources, sources shared by every room and unrelated devices that the
+integration has to skip over.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import random
+from typing import Any, NamedTuple
+from urllib.parse import unquote
+
+from pyControl4.account import C4Account
+from pyControl4.director import C4Director
+
+CONTROLLER_UNIQUE_ID = "control4_ea5_000FFF000000"
+DIRECTOR_SW_VERSION = "3.3.0"
+
+ROOMS_PER_FLOOR = 25
+LIGHTS_PER_ROOM = 6
+SHARED_SOURCES = 8
+OTHER_DEVICES_PER_ROOM = 4
+
+
+class Project(NamedTuple):
+    """Payloads of a synthetic Control4 project."""
+
+    items: list[dict[str, Any]]
+    ui_configuration: dict[str, Any]
+    variables: list[dict[str, Any]]
+
+
+def generate_project(rooms: int, seed: int = 0) -> Project:
+    """Generate a project with the given number of rooms.
+
+    Each room adds 21 items, so 2,000 rooms make a 42k item project.
+    """
+    rand = random.Random(seed)
+    items: list[dict[str, Any]] = [
+        {"id": 1, "typeName": "root", "name": "Project"},
+        {"id": 2, "typeName": "site", "name": "Home", "parentId": 1},
+    ]
+    variables: list[dict[str, Any]] = []
+    experiences: list[dict[str, Any]] = []
+    next_id = 3
+
+    def add_item(**item: Any) -> int:
+        nonlocal next_id
+        item["id"] = next_id
+        items.append(item)
+        next_id += 1
+        return item["id"]
+
+    def add_variables(item_id: int, values: dict[str, Any]) -> None:
+        variables.extend(
+            {"id": item_id, "varName": var_name, "value": value}
+            for var_name, value in values.items()
+        )
+
+    def add_source(name: str, parent_id: int) -> int:
+        """Add a source device reporting its playback, with a proxy child.
+
+        Rooms name the device in their media info, and the integration reads
+        the playback state from it or its parents, never from its children.
+        """
+        device_id = add_item(typeName="device", name=name, parentId=parent_id)
+        add_item(typeName="device", name=f"{name} Proxy", parentId=device_id)
+        state = rand.choice(("PLAYING", "PAUSED", "STOPPED", None))
+        add_variables(
+            device_id,
+            {
+                "PLAYING": int(state == "PLAYING"),
+                "PAUSED": int(state == "PAUSED"),
+                "STOPPED": int(state == "STOPPED"),
+            },
+        )
+        return device_id
+
+    media_server = add_item(typeName="device", name="Media Server", parentId=2)
+    shared_sources = [
+        add_source(f"Streaming Service {index}", media_server)
+        for index in range(SHARED_SOURCES)
+    ]
+
+    floor_id = 2
+    for room_index in range(rooms):
+        if room_index % ROOMS_PER_FLOOR == 0:
+            floor_id = add_item(
+                typeName="floor",
+                name=f"Floor {room_index // ROOMS_PER_FLOOR}",
+                parentId=2,
+            )
+        room_id = add_item(
+            typeName="room",
+            name=f"Room {room_index}",
+            parentId=floor_id,
+            roomHidden=room_index % 50 == 49,
+        )
+
+        for light_index in range(LIGHTS_PER_ROOM):
+            is_dimmer = light_index % 3 != 2
+            load_id = add_item(
+                typeName="device",
+                name=f"{'Dimmer' if is_dimmer else 'Switch'} {light_index}",
+                parentId=room_id,
+                categories=["lights"],
+                type=6,
+                manufacturer="Control4",
+                model="C4-APD120" if is_dimmer else "C4-SW120277",
+            )
+            light_id = add_item(
+                typeName="device",
+                name=f"Light {light_index}",
+                parentId=load_id,
+                roomId=room_id,
+                categories=["lights"],
+                type=7,
+            )
+            level = rand.choice((0, 0, 25, 50, 100))
+            if is_dimmer:
+                add_variables(
+                    light_id, {"LIGHT_LEVEL": level, "LIGHT_STATE": int(level > 0)}
+                )
+            else:
+                add_variables(light_id, {"LIGHT_STATE": int(level > 0)})
+
+        television = add_source("Television", room_id)
+        receiver = add_source("Receiver", room_id)
+        for device_index in range(OTHER_DEVICES_PER_ROOM):
+            add_item(
+                typeName="device",
+                name=f"Keypad {device_index}",
+                parentId=room_id,
+                categories=["keypads"],
+                type=6,
+            )
+
+        playing = 0
+        media_info: dict[str, Any] = {}
+        if rand.random() < 0.4:
+            playing = rand.choice((television, receiver, *shared_sources))
+            media_info = {
+                "mediainfo": {
+                    "title": f"Title {rand.randrange(1000)}",
+                    "medSrcDev": playing,
+                }
+            }
+        add_variables(
+            room_id,
+            {
+                "POWER_STATE": int(bool(playing)),
+                "CURRENT_VOLUME": rand.randrange(101),
+                "IS_MUTED": 0,
+                "CURRENT_VIDEO_DEVICE": playing if playing == television else 0,
+                "CURRENT MEDIA INFO": media_info,
+            },
+        )
+
+        experiences.append(
+            {
+                "type": "watch",
+                "room_id": room_id,
+                "sources": {"source": [{"id": television, "type": "VIDEO_SELECTION"}]},
+            }
+        )
+        experiences.append(
+            {
+                "type": "listen",
+                "room_id": room_id,
+                "sources": {
+                    "source": [
+                        {"id": source_id, "type": "AUDIO_SELECTION"}
+                        for source_id in (receiver, *shared_sources)
+                    ]
+                },
+            }
+        )
+
+    return Project(items, {"experiences": experiences}, variables)
+
+
+class FixtureDirector(C4Director):
+    """Director that answers from a synthetic project instead of a controller."""
+
+    def __init__(
+        self,
+        project: Project,
+        ip: str,
+        director_bearer_token: str,
+        session_no_verify_ssl=None,
+    ) -> None:
+        """Initialize the fixture director."""
+        super().__init__(ip, director_bearer_token, session_no_verify_ssl)
+        self._project = project
+        self._items = {item["id"]: item for item in project.items}
+        self._variables_by_name: dict[str, list[dict[str, Any]]] = {}
+        for variable in project.variables:
+            self._variables_by_name.setdefault(variable["varName"], []).append(variable)
+        # Serialize each distinct request once so only the integration is timed
+        self._responses: dict[str, str] = {}
+
+    async def sendGetRequest(self, uri: str) -> str:
+        """Return the payload the director would send for a GET request."""
+        if (response := self._responses.get(uri)) is None:
+            response = self._responses[uri] = json.dumps(self._get(uri))
+        return response
+
+    async def sendPostRequest(
+        self, uri: str, command: str, params: dict, async_variable: bool = True
+    ) -> str:
+        """Accept a command without changing the project."""
+        return "{}"
+
+    def _get(self, uri: str) -> Any:
+        """Build the response to a GET request."""
+        path, _, query = uri.partition("?")
+        parts = path.strip("/").split("/")[2:]
+        if parts == ["items"]:
+            return self._project.items
+        if parts == ["agents", "ui_configuration"]:
+            return self._project.ui_configuration
+        if parts == ["items", "variables"]:
+            var_names = unquote(query.removeprefix("varnames=")).split(",")
+            return [
+                variable
+                for var_name in var_names
+                for variable in self._variables_by_name.get(var_name, ())
+            ]
+        if parts[0] == "categories":
+            return [
+                item
+                for item in self._project.items
+                if parts[1] in item.get("categories", ())
+            ]
+        if parts[0] == "items" and len(parts) == 2:
+            return [self._items[int(parts[1])]]
+        if parts[0] == "items" and parts[2] == "variables":
+            item_id = int(parts[1])
+            return [
+                variable
+                for variable in self._project.variables
+                if variable["id"] == item_id
+            ]
+        raise ValueError(f"Unsupported request {uri}")
+
+
+class FixtureAccount(C4Account):
+    """Control4 account that hands out tokens without contacting the cloud."""
+
+    _director_tokens = itertools.count(1)
+
+    async def getAccountBearerToken(self) -> str:
+        """Return a fake account token."""
+        self.account_bearer_token = "account-token"
+        return self.account_bearer_token
+
+    async def getAccountControllers(self) -> dict[str, str]:
+        """Return the controller of the fixture project."""
+        return {
+            "controllerCommonName": CONTROLLER_UNIQUE_ID,
+            "href": "https://apis.control4.com/account/v3/rest/accounts/1",
+            "name": "Benchmark",
+        }
+
+    async def getControllerOSVersion(self, controller_href: str) -> str:
+        """Return the software version of the fixture director."""
+        return DIRECTOR_SW_VERSION
+
+    async def getDirectorBearerToken(self, controller_common_name: str) -> dict:
+        """Return a new fake director token valid for a day."""
+        return {
+            "token": f"director-token-{next(self._director_tokens)}",
+            "validSeconds": 86400,
+        }
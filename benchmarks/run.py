@@ -0,0 +1,424 @@
+"""Benchmark the Control4 integration against synthetic projects.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.run --rooms 50 200 1000 2000 --output bench_output.txt
+
+For every project size this times, in seconds:
+
+- setup_cold: async_setup_entry for the hub and both platforms without a
+  cached catalog, including registering the entities with Home Assistant.
+- setup_warm: the same with the catalog cached by a previous setup.
+- poll_parse: one poll of all registered variables through
+  _update_variables_for_config_entry, including decoding the payload.
+- update_fanout: pushing an update in which a tenth of the rooms and lights
+  changed to the coordinator, which writes the state of affected entities.
+- property_eval: reading the state properties of every room and light.
+- volume_drag: 30 volume changes on one room, as sent by dragging a slider.
+
+By default the director answers in-process. With --latency the integration
+talks HTTPS to a DirectorSimulator that delays every request instead, and
+the number of requests it served and how many of them reused a kept-alive
+connection instead of a new TLS handshake are reported too.
+
+Results are written as JSON so runs can be compared across commits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import ExitStack
+from datetime import timedelta
+from functools import partial
+import importlib
+import importlib.metadata
+import json
+import logging
+import platform
+import statistics
+import tempfile
+from time import perf_counter
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant import bootstrap, loader
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    __version__ as HA_VERSION,
+)
+from homeassistant.components.media_player import MediaPlayerState
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from custom_components.control4 import PLATFORMS
+from custom_components.control4.const import (
+    CONF_CONTROLLER_UNIQUE_ID,
+    CONF_COORDINATOR,
+    CONF_METRICS,
+    CONF_PUSH_UPDATES,
+    DOMAIN,
+)
+from custom_components.control4.director_utils import (
+    Control4VariableCoordinator,
+    _update_variables_for_config_entry,
+)
+from custom_components.control4.metrics import Control4Metrics
+
+from .director_simulator import DirectorSimulator
+from .fixtures import (
+    CONTROLLER_UNIQUE_ID,
+    FixtureAccount,
+    FixtureDirector,
+    Project,
+    generate_project,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_ROOMS = (50, 200, 1000, 2000)
+ENTRY_ID = "benchmark"
+
+ROOM_PROPERTIES = (
+    "state",
+    "source",
+    "media_title",
+    "media_content_type",
+    "volume_level",
+    "is_volume_muted",
+)
+LIGHT_PROPERTIES = ("is_on", "brightness")
+
+
+class _Hub:
+    """A Home Assistant instance with the integration set up on a project."""
+
+    def __init__(self, host: str, config_dir: str) -> None:
+        """Initialize the hub."""
+        self.host = host
+        self.config_dir = config_dir
+        self.hass: HomeAssistant | None = None
+        self.entry: ConfigEntry | None = None
+        self.platforms: dict[str, EntityPlatform] = {}
+
+    async def async_setup(self) -> float:
+        """Set up the integration and return how long it took."""
+        hass = self.hass = HomeAssistant(self.config_dir)
+        loader.async_setup(hass)
+        hass.config_entries = ConfigEntries(hass, {})
+        await bootstrap.async_load_base_functionality(hass)
+        await hass.async_start()
+        # The light and media player components need the full HTTP stack, so
+        # entities are added to bare entity platforms instead.
+        hass.config_entries.async_forward_entry_setups = self._async_setup_platforms
+
+        # A restarted hub set up the stored entry of the previous instance
+        if entry := hass.config_entries.async_get_entry(ENTRY_ID):
+            self.entry = entry
+            start = perf_counter()
+            await hass.config_entries.async_setup(entry.entry_id)
+        else:
+            self.entry = ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain=DOMAIN,
+                title=CONTROLLER_UNIQUE_ID,
+                data={
+                    CONF_HOST: self.host,
+                    CONF_USERNAME: "benchmark",
+                    CONF_PASSWORD: "benchmark",
+                    CONF_CONTROLLER_UNIQUE_ID: CONTROLLER_UNIQUE_ID,
+                },
+                source="user",
+                options={CONF_PUSH_UPDATES: False},
+                entry_id=ENTRY_ID,
+            )
+            start = perf_counter()
+            await hass.config_entries.async_add(self.entry)
+        elapsed = perf_counter() - start
+        await hass.async_block_till_done()
+        return elapsed
+
+    async def _async_setup_platforms(self, entry: ConfigEntry, platforms) -> bool:
+        """Set up the integration platforms on bare entity platforms."""
+        for domain in platforms:
+            entity_platform = self.platforms[domain] = EntityPlatform(
+                hass=self.hass,
+                logger=_LOGGER.getChild("platform"),
+                domain=domain,
+                platform_name=DOMAIN,
+                platform=importlib.import_module(
+                    f"custom_components.{DOMAIN}.{domain}"
+                ),
+                scan_interval=timedelta(seconds=30),
+                entity_namespace=None,
+            )
+            await entity_platform.async_setup_entry(entry)
+        return True
+
+    @property
+    def metrics(self) -> Control4Metrics:
+        """Return the metrics of the entry."""
+        return self.hass.data[DOMAIN][self.entry.entry_id][CONF_METRICS]
+
+    @property
+    def coordinator(self) -> Control4VariableCoordinator:
+        """Return the variable coordinator of the entry."""
+        return self.hass.data[DOMAIN][self.entry.entry_id][CONF_COORDINATOR]
+
+    def entities(self, domain: str) -> list[Any]:
+        """Return the entities of a platform."""
+        return list(self.platforms[domain].entities.values())
+
+    async def async_stop(self) -> None:
+        """Unload the integration and stop Home Assistant."""
+        await self.hass.config_entries.async_unload(self.entry.entry_id)
+        await self.hass.async_stop()
+
+
+def _stats(samples: list[float]) -> dict[str, float]:
+    """Summarize timing samples."""
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+    }
+
+
+def _changed_data(
+    data: dict[int, dict[str, Any]], item_ids: list[int], generation: int
+) -> dict[int, dict[str, Any]]:
+    """Return a copy of the variables with some items changed."""
+    data = dict(data)
+    for item_id in item_ids[generation % 10 :: 10]:
+        item_data = data[item_id] = dict(data[item_id])
+        if "CURRENT_VOLUME" in item_data:
+            item_data["CURRENT_VOLUME"] = (item_data["CURRENT_VOLUME"] + 1) % 101
+        elif "LIGHT_LEVEL" in item_data:
+            item_data["LIGHT_LEVEL"] = (item_data["LIGHT_LEVEL"] + 1) % 101
+        else:
+            item_data["LIGHT_STATE"] = int(not item_data["LIGHT_STATE"])
+    return data
+
+
+def _connection_stats(metrics: Control4Metrics) -> dict[str, Any]:
+    """Summarize how often connections to the director were reused."""
+    return {
+        "created": metrics.connection_setup.count,
+        "reused": metrics.connections_reused,
+        "mean_setup": metrics.connection_setup.mean,
+        "handshake_time_saved": metrics.handshake_time_saved,
+    }
+
+
+async def _async_time(
+    repeat: int, func: Callable[[], Awaitable[Any] | Any]
+) -> dict[str, float]:
+    """Time a function or coroutine function repeatedly."""
+    samples = []
+    for _ in range(repeat):
+        start = perf_counter()
+        if asyncio.iscoroutine(result := func()):
+            await result
+        samples.append(perf_counter() - start)
+    return _stats(samples)
+
+
+async def _async_check_playing_rooms(hub: _Hub, project: Project) -> None:
+    """Check that rooms playing a source report it, so timings mean something."""
+    await hub.hass.async_block_till_done()
+    variables: dict[int, dict[str, Any]] = {}
+    for variable in project.variables:
+        variables.setdefault(variable["id"], {})[variable["varName"]] = variable[
+            "value"
+        ]
+    playing = [
+        room
+        for room in hub.entities("media_player")
+        if room.hass is not None
+        and (media_info := variables[room._idx]["CURRENT MEDIA INFO"])
+        and variables[media_info["mediainfo"]["medSrcDev"]]["PLAYING"]
+    ]
+    assert playing, "The project has no room playing a source"
+    for room in playing:
+        assert (
+            room.state == MediaPlayerState.PLAYING
+        ), f"{room.entity_id} is {room.state} instead of playing"
+
+
+async def _async_benchmark_updates(hub: _Hub, repeat: int) -> dict[str, Any]:
+    """Time polling and state updates on a set up hub."""
+    rooms = hub.entities("media_player")
+    lights = hub.entities("light")
+    result: dict[str, Any] = {
+        "room_entities": len(rooms),
+        "light_entities": len(lights),
+    }
+
+    coordinator = hub.coordinator
+    result["poll_parse"] = await _async_time(
+        repeat,
+        partial(
+            _update_variables_for_config_entry,
+            hub.hass,
+            hub.entry,
+            coordinator.variable_names,
+        ),
+    )
+
+    item_ids = [entity._idx for entity in rooms + lights]
+    generation = 0
+
+    def push_update() -> None:
+        nonlocal generation
+        generation += 1
+        coordinator.async_set_updated_data(
+            _changed_data(coordinator.data, item_ids, generation)
+        )
+
+    result["update_fanout"] = await _async_time(repeat, push_update)
+
+    def read_properties() -> None:
+        for entity in rooms:
+            for name in ROOM_PROPERTIES:
+                getattr(entity, name)
+        for entity in lights:
+            for name in LIGHT_PROPERTIES:
+                getattr(entity, name)
+
+    result["property_eval"] = await _async_time(repeat, read_properties)
+
+    async def volume_drag() -> None:
+        await asyncio.gather(
+            *(rooms[0].async_set_volume_level(step / 100) for step in range(30))
+        )
+
+    result["volume_drag"] = await _async_time(repeat, volume_drag)
+    return result
+
+
+async def async_benchmark_project(
+    rooms: int, repeat: int, latency: float | None = None
+) -> dict[str, Any]:
+    """Run all benchmarks for a project with the given number of rooms."""
+    project = generate_project(rooms)
+    result: dict[str, Any] = {
+        "rooms": rooms,
+        "items": len(project.items),
+        "variables": len(project.variables),
+    }
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch(f"custom_components.{DOMAIN}.C4Account", FixtureAccount)
+        )
+        simulator: DirectorSimulator | None = None
+        if latency is None:
+            host = "192.0.2.1"
+            # The in-process director answers instantly, so requests are not
+            # scheduled or rate limited
+            stack.enter_context(
+                patch(
+                    f"custom_components.{DOMAIN}.director_utils.Control4Director",
+                    lambda ip, token, session, _scheduler: FixtureDirector(
+                        project, ip, token, session
+                    ),
+                )
+            )
+        else:
+            simulator = DirectorSimulator(project, latency=latency)
+            host = await simulator.async_start()
+
+        try:
+            cold, warm = [], []
+            for iteration in range(repeat):
+                with tempfile.TemporaryDirectory() as config_dir:
+                    hub = _Hub(host, config_dir)
+                    cold.append(await hub.async_setup())
+                    await hub.async_stop()
+                    hub = _Hub(host, config_dir)
+                    warm.append(await hub.async_setup())
+                    if iteration == repeat - 1:
+                        await _async_check_playing_rooms(hub, project)
+                        result.update(await _async_benchmark_updates(hub, repeat * 5))
+                        if simulator is not None:
+                            result["connections"] = _connection_stats(hub.metrics)
+                    await hub.async_stop()
+        finally:
+            if simulator is not None:
+                await simulator.async_stop()
+        result["setup_cold"] = _stats(cold)
+        result["setup_warm"] = _stats(warm)
+        if simulator is not None:
+            result["director_requests"] = dict(simulator.requests)
+            result["director_commands"] = dict(simulator.commands)
+
+    return result
+
+
+async def async_main(
+    rooms: list[int], repeat: int, latency: float | None
+) -> dict[str, Any]:
+    """Run the benchmarks for every project size."""
+    # Import the platforms up front so the first setup is not charged for it
+    for domain in PLATFORMS:
+        importlib.import_module(f"custom_components.{DOMAIN}.{domain}")
+
+    results = []
+    for room_count in rooms:
+        _LOGGER.info("Benchmarking a project with %s rooms", room_count)
+        results.append(await async_benchmark_project(room_count, repeat, latency))
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "homeassistant": HA_VERSION,
+            "pyControl4": importlib.metadata.version("pyControl4"),
+            "machine": platform.machine(),
+        },
+        "repeat": repeat,
+        "latency": latency,
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Parse the command line and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rooms",
+        type=int,
+        nargs="+",
+        default=DEFAULT_ROOMS,
+        help="project sizes to benchmark, in rooms",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="number of setups per project size"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        help="serve the project from a director simulator with this latency",
+    )
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Home Assistant warns that the integration is a custom one on every setup
+    logging.getLogger("homeassistant").setLevel(logging.ERROR)
+    _LOGGER.getChild("platform").setLevel(logging.WARNING)
+
+    report = asyncio.run(async_main(args.rooms, args.repeat, args.latency))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
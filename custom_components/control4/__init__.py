@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timedelta
+from functools import partial
 import logging
-from typing import Any
+import random
+from time import monotonic
+from typing import Any, Generic, TypeVar
 
 from aiohttp import client_exceptions
 from pyControl4.account import C4Account
-from pyControl4.director import C4Director
 from pyControl4.error_handling import BadCredentials
 
 from homeassistant.config_entries import ConfigEntry
@@ -16,37 +20,101 @@ from homeassistant.const import (
     CONF_HOST,
     CONF_PASSWORD,
     CONF_SCAN_INTERVAL,
-    CONF_TOKEN,
     CONF_USERNAME,
     Platform,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import aiohttp_client, device_registry as dr
-from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
+from homeassistant.helpers import (
+    aiohttp_client,
+    device_registry as dr,
+    entity_registry as er,
 )
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    ATTR_STALE_SINCE,
+    CATALOG_REFRESH_INTERVAL,
+    COMMAND_CONFIRM_TIMEOUT,
     CONF_ACCOUNT,
+    CONF_ARTWORK_CACHE,
+    CONF_CATALOG,
+    CONF_COMMAND_DISPATCHER,
     CONF_CONFIG_LISTENER,
     CONF_CONTROLLER_UNIQUE_ID,
+    CONF_COORDINATOR,
     CONF_DIRECTOR,
-    CONF_DIRECTOR_ALL_ITEMS,
     CONF_DIRECTOR_MODEL,
+    CONF_DIRECTOR_SESSION,
     CONF_DIRECTOR_SW_VERSION,
-    CONF_UI_CONFIGURATION,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_METRICS,
+    CONF_PUSH_UPDATES,
+    CONF_REQUEST_SCHEDULER,
+    CONF_TOKEN_MANAGER,
+    CONF_WEBSOCKET,
+    DATA_POLL_STAGGER,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_PUSH_UPDATES,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    SIGNAL_CATALOG_UPDATED,
+)
+from .artwork import Control4ArtworkCache
+from .cache import Control4CatalogCache, async_fetch_catalog, async_revalidate_catalog
+from .catalog import Control4Catalog
+from .commands import Command, Control4CommandCoalescer, Control4CommandDispatcher
+from .director_utils import (
+    Control4PollScheduler,
+    Control4PollStagger,
+    Control4TokenManager,
+    Control4VariableCoordinator,
 )
+from .metrics import Control4Metrics
+from .request_scheduler import Control4RequestScheduler
+from .session import async_create_director_session
+from .websocket import Control4PushUpdater
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.LIGHT, Platform.MEDIA_PLAYER]
+PLATFORMS = [Platform.LIGHT, Platform.MEDIA_PLAYER, Platform.SENSOR]
 
 API_RETRY_TMES = 5
+API_RETRY_BASE_DELAY = 0.5
+
+_T = TypeVar("_T")
+_SpecT = TypeVar("_SpecT")
+
+
+async def _async_retry(func: Callable[[], Awaitable[_T]]) -> _T:
+    """Call the Control4 account API, retrying with jittered exponential backoff."""
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except client_exceptions.ClientError as exception:
+            _LOGGER.error("Error connecting to Control4 account API: %s", exception)
+            if attempt == API_RETRY_TMES - 1:
+                raise ConfigEntryNotReady(exception) from exception
+        await asyncio.sleep(random.uniform(0, API_RETRY_BASE_DELAY * 2**attempt))
+        attempt += 1
+
+
+async def _async_timed(
+    timings: dict[str, float], step: str, awaitable: Awaitable[_T]
+) -> _T:
+    """Await a setup step and record how long it took."""
+    start = monotonic()
+    try:
+        return await awaitable
+    finally:
+        timings[step] = monotonic() - start
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -54,11 +122,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     entry_data = hass.data[DOMAIN].setdefault(entry.entry_id, {})
     account_session = aiohttp_client.async_get_clientsession(hass)
+    metrics = entry_data[CONF_METRICS] = Control4Metrics()
+    timings = metrics.setup_timings
+    setup_start = monotonic()
 
     config = entry.data
     account = C4Account(config[CONF_USERNAME], config[CONF_PASSWORD], account_session)
     try:
-        await account.getAccountBearerToken()
+        await _async_timed(timings, "account_token", account.getAccountBearerToken())
     except client_exceptions.ClientError as exception:
         _LOGGER.error("Error connecting to Control4 account API: %s", exception)
         raise ConfigEntryNotReady from exception
@@ -76,37 +147,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     controller_unique_id = config[CONF_CONTROLLER_UNIQUE_ID]
     entry_data[CONF_CONTROLLER_UNIQUE_ID] = controller_unique_id
 
-    # Add retry for C4 Account API due to instability
-    for i in range(API_RETRY_TMES):
-        try:
-            director_token_dict = await account.getDirectorBearerToken(
-                controller_unique_id
-            )
-            break
-        except client_exceptions.ClientError as exception:
-            _LOGGER.error("Error connecting to Control4 account API: %s", exception)
-            if i == API_RETRY_TMES - 1:
-                raise ConfigEntryNotReady(exception) from exception
+    async def async_get_os_version() -> str:
+        controller_href = (await account.getAccountControllers())["href"]
+        return await account.getControllerOSVersion(controller_href)
+
+    # The director token, controller OS version and cached catalog are
+    # independent of each other. Retries are due to C4 Account API instability.
+    cache = Control4CatalogCache(hass, entry.entry_id)
+    director_token_dict, entry_data[CONF_DIRECTOR_SW_VERSION], _ = await asyncio.gather(
+        _async_timed(
+            timings,
+            "director_token",
+            _async_retry(partial(account.getDirectorBearerToken, controller_unique_id)),
+        ),
+        _async_timed(timings, "os_version", _async_retry(async_get_os_version)),
+        _async_timed(timings, "cache_load", cache.async_load()),
+    )
 
-    director_session = aiohttp_client.async_get_clientsession(hass, verify_ssl=False)
-    director = C4Director(
-        config[CONF_HOST], director_token_dict[CONF_TOKEN], director_session
+    session = entry_data[CONF_DIRECTOR_SESSION] = async_create_director_session(
+        hass, entry, metrics
+    )
+    scheduler = entry_data[CONF_REQUEST_SCHEDULER] = Control4RequestScheduler(metrics)
+    token_manager = Control4TokenManager(
+        hass, entry, account, director_token_dict, session, scheduler
     )
+    entry.async_on_unload(token_manager.async_shutdown)
+    entry_data[CONF_TOKEN_MANAGER] = token_manager
+    director = token_manager.director
     entry_data[CONF_DIRECTOR] = director
-
-    # Add retry for C4 Account API due to instability
-    for i in range(API_RETRY_TMES):
-        try:
-            # Add Control4 controller to device registry
-            controller_href = (await account.getAccountControllers())["href"]
-            entry_data[CONF_DIRECTOR_SW_VERSION] = await account.getControllerOSVersion(
-                controller_href
-            )
-            break
-        except client_exceptions.ClientError as exception:
-            _LOGGER.error("Error connecting to Control4 account API: %s", exception)
-            if i == API_RETRY_TMES - 1:
-                raise ConfigEntryNotReady(exception) from exception
+    entry_data[CONF_ARTWORK_CACHE] = Control4ArtworkCache(
+        hass,
+        config[CONF_HOST],
+        session,
+        aiohttp_client.async_get_clientsession(hass),
+        metrics,
+    )
 
     _, model, mac_address = controller_unique_id.split("_", 3)
     entry_data[CONF_DIRECTOR_MODEL] = model.upper()
@@ -122,29 +197,151 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         sw_version=entry_data[CONF_DIRECTOR_SW_VERSION],
     )
 
-    # Store all items found on controller for platforms to use
-    director_all_items = await director.getAllItemInfo()
-    director_all_items = json.loads(director_all_items)
-    entry_data[CONF_DIRECTOR_ALL_ITEMS] = director_all_items
+    # Store all items found on controller for platforms to use, from the cache
+    # when the director software is unchanged since it was saved
+    director_sw_version = entry_data[CONF_DIRECTOR_SW_VERSION]
+    if cached := cache.pop(director_sw_version):
+        director_all_items, ui_configuration, _ = cached
+    else:
+        director_all_items, ui_configuration, fingerprint = await _async_timed(
+            timings, "catalog_fetch", async_fetch_catalog(hass, director)
+        )
+        await cache.async_save(
+            director_sw_version, fingerprint, director_all_items, ui_configuration
+        )
+    entry_data[CONF_CATALOG] = await _async_timed(
+        timings,
+        "catalog_index",
+        hass.async_add_executor_job(
+            Control4Catalog, director_all_items, ui_configuration
+        ),
+    )
+
+    # Platforms register the variables they need with the shared coordinator
+    scheduler = Control4PollScheduler(*_load_scan_intervals(entry, entry_data))
+    coordinator = Control4VariableCoordinator(hass, entry, scheduler)
+    entry_data[CONF_COORDINATOR] = coordinator
+    # Controllers of other entries poll at different fractions of a second
+    stagger = hass.data.setdefault(DATA_POLL_STAGGER, Control4PollStagger())
+    entry.async_on_unload(stagger.async_add(coordinator))
+    # Commands of all entities share one concurrency limit and one refresh
+    entry_data[CONF_COMMAND_DISPATCHER] = Control4CommandDispatcher(
+        metrics, coordinator.async_refresh_after_commands
+    )
+
+    if entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES):
+        _async_start_push_updates(hass, entry, coordinator)
+
+    entry_data[CONF_CONFIG_LISTENER] = entry.add_update_listener(update_listener)
+
+    await _async_timed(
+        timings,
+        "platforms",
+        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS),
+    )
+
+    # Platforms add, remove and update entities as the project changes. A
+    # cached catalog is checked right away, a fetched one after an interval.
+    async def async_update_catalog(_now: datetime | None = None) -> None:
+        await _async_update_catalog(hass, entry, cache, director_sw_version)
+
+    if cached:
+        entry.async_create_background_task(
+            hass, async_update_catalog(), "control4_catalog_revalidate"
+        )
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            async_update_catalog,
+            timedelta(seconds=CATALOG_REFRESH_INTERVAL),
+            cancel_on_shutdown=True,
+        )
+    )
+
+    timings["total"] = monotonic() - setup_start
+    _LOGGER.debug(
+        "Control4 setup took %.3fs (%s)",
+        timings["total"],
+        ", ".join(f"{step}={duration:.3f}s" for step, duration in timings.items()),
+    )
+    return True
 
-    entry_data[CONF_UI_CONFIGURATION] = json.loads(await director.getUiConfiguration())
 
-    # Load options from config entry
+def _load_scan_intervals(
+    entry: ConfigEntry, entry_data: dict[str, Any]
+) -> tuple[float, float, float]:
+    """Store the poll intervals from the options and return them."""
     entry_data[CONF_SCAN_INTERVAL] = entry.options.get(
         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
     )
+    entry_data[CONF_FAST_SCAN_INTERVAL] = entry.options.get(
+        CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL
+    )
+    entry_data[CONF_IDLE_SCAN_INTERVAL] = entry.options.get(
+        CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL
+    )
+    return (
+        entry_data[CONF_FAST_SCAN_INTERVAL],
+        entry_data[CONF_SCAN_INTERVAL],
+        entry_data[CONF_IDLE_SCAN_INTERVAL],
+    )
 
-    entry_data[CONF_CONFIG_LISTENER] = entry.add_update_listener(update_listener)
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+@callback
+def _async_start_push_updates(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: Control4VariableCoordinator
+) -> None:
+    """Connect the WebSocket for pushed variable changes in the background."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    push_updater = Control4PushUpdater(hass, entry, coordinator)
+    entry_data[CONF_WEBSOCKET] = push_updater
+    entry.async_create_background_task(
+        hass,
+        push_updater.async_connect(entry_data[CONF_TOKEN_MANAGER].token),
+        "control4_websocket_connect",
+    )
 
-    return True
+
+async def _async_update_catalog(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    cache: Control4CatalogCache,
+    director_sw_version: str,
+) -> None:
+    """Hand the new catalog to the platforms if the project changed."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    changed = await async_revalidate_catalog(
+        hass, cache, entry_data[CONF_DIRECTOR], director_sw_version
+    )
+    if changed is None:
+        return
+    director_all_items, ui_configuration, _ = changed
+    entry_data[CONF_CATALOG] = await hass.async_add_executor_job(
+        Control4Catalog, director_all_items, ui_configuration
+    )
+    async_dispatcher_send(
+        hass, SIGNAL_CATALOG_UPDATED.format(entry.entry_id), entry_data[CONF_CATALOG]
+    )
 
 
 async def update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
-    """Update when config_entry options update."""
-    _LOGGER.debug("Config entry was updated, rerunning setup")
-    await hass.config_entries.async_reload(config_entry.entry_id)
+    """Apply changed options to the running entry without reloading it."""
+    _LOGGER.debug("Config entry options were updated, applying them")
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator: Control4VariableCoordinator = entry_data[CONF_COORDINATOR]
+
+    push_updates = config_entry.options.get(CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES)
+    push_updater: Control4PushUpdater | None = entry_data.get(CONF_WEBSOCKET)
+    if push_updates and push_updater is None:
+        _async_start_push_updates(hass, config_entry, coordinator)
+    elif not push_updates and push_updater is not None:
+        del entry_data[CONF_WEBSOCKET]
+        await push_updater.async_disconnect()
+        coordinator.async_set_push_connected(False)
+
+    await coordinator.async_set_intervals(
+        *_load_scan_intervals(config_entry, entry_data)
+    )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -152,6 +349,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     hass.data[DOMAIN][entry.entry_id][CONF_CONFIG_LISTENER]()
+    if push_updater := hass.data[DOMAIN][entry.entry_id].get(CONF_WEBSOCKET):
+        await push_updater.async_disconnect()
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
         _LOGGER.debug("Unloaded entry for %s", entry.entry_id)
@@ -159,23 +358,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
-async def get_items_of_category(hass: HomeAssistant, entry: ConfigEntry, category: str):
-    """Return a list of all Control4 items with the specified category."""
-    director_all_items = hass.data[DOMAIN][entry.entry_id][CONF_DIRECTOR_ALL_ITEMS]
-    return [
-        item
-        for item in director_all_items
-        if "categories" in item and category in item["categories"]
-    ]
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached catalog of a deleted config entry."""
+    await Control4CatalogCache(hass, entry.entry_id).async_remove()
+
+
+def _value_matches(actual: Any, expected: Any, tolerance: float) -> bool:
+    """Return whether a reported variable value confirms an expected one."""
+    if (
+        tolerance
+        and isinstance(actual, int | float)
+        and isinstance(expected, int | float)
+    ):
+        return abs(actual - expected) <= tolerance
+    return actual == expected
 
 
-class Control4Entity(CoordinatorEntity[Any]):
+class Control4Entity(CoordinatorEntity[Control4VariableCoordinator]):
     """Base entity for Control4."""
 
     def __init__(
         self,
         entry_data: dict,
-        coordinator: DataUpdateCoordinator[Any],
+        coordinator: Control4VariableCoordinator,
         name: str,
         idx: int,
         device_name: str | None,
@@ -184,7 +389,8 @@ class Control4Entity(CoordinatorEntity[Any]):
         device_id: int,
     ) -> None:
         """Initialize a Control4 entity."""
-        super().__init__(coordinator)
+        # Only woken by the coordinator when the variables of these items change
+        super().__init__(coordinator, context={idx})
         self.entry_data = entry_data
         self._attr_name = name
         self._attr_unique_id = str(idx)
@@ -194,6 +400,118 @@ class Control4Entity(CoordinatorEntity[Any]):
         self._device_manufacturer = device_manufacturer
         self._device_model = device_model
         self._device_id = device_id
+        # Optimistic variable values awaiting confirmation, with tolerance
+        self._pending: dict[str, tuple[Any, float]] = {}
+        self._unsub_pending_timeout: CALLBACK_TYPE | None = None
+        self._commands = Control4CommandCoalescer(entry_data[CONF_COMMAND_DISPATCHER])
+
+    @property
+    def available(self) -> bool:
+        """Return whether the director reported this item in the last update."""
+        return super().available and self._idx in self.coordinator.data
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Mark the state as stale while the director is offline."""
+        if (stale_since := self.coordinator.stale_since) is None:
+            return None
+        return {ATTR_STALE_SINCE: stale_since}
+
+    @property
+    def _item_data(self) -> dict[str, Any]:
+        """Return the variables of this item, overlaid with optimistic values.
+
+        Empty until the director reports the item, such as right after it was
+        added to the project.
+        """
+        item_data = self.coordinator.data.get(self._idx, {})
+        if not self._pending:
+            return item_data
+        return {
+            **item_data,
+            **{var: value for var, (value, _) in self._pending.items()},
+        }
+
+    @callback
+    def _async_expect(
+        self,
+        values: dict[str, Any],
+        tolerance: float = 0,
+        timeout: float = COMMAND_CONFIRM_TIMEOUT,
+    ) -> None:
+        """Show values optimistically until the director reports them.
+
+        Values the director has not confirmed within the timeout are dropped,
+        reverting the entity to the reported state.
+        """
+        for var, value in values.items():
+            self._pending[var] = (value, tolerance)
+        if self._unsub_pending_timeout:
+            self._unsub_pending_timeout()
+        self._unsub_pending_timeout = async_call_later(
+            self.hass, timeout, self._async_pending_timeout
+        )
+        self.async_write_ha_state()
+
+    async def _async_send_expecting(
+        self,
+        kind: str | None,
+        command: Command,
+        values: dict[str, Any],
+        tolerance: float = 0,
+        timeout: float = COMMAND_CONFIRM_TIMEOUT,
+    ) -> None:
+        """Send a command, showing the values it sets until they are confirmed.
+
+        The values are dropped right away if the command fails, unless a
+        newer command expects other values for them by then.
+        """
+        self._async_expect(values, tolerance, timeout)
+        expected = {var: self._pending[var] for var in values}
+        try:
+            await self._commands.async_send(kind, command)
+        except Exception:
+            for var, pending in expected.items():
+                if self._pending.get(var) is pending:
+                    del self._pending[var]
+            if not self._pending and self._unsub_pending_timeout:
+                self._unsub_pending_timeout()
+                self._unsub_pending_timeout = None
+            self.async_write_ha_state()
+            raise
+
+    @callback
+    def _async_pending_timeout(self, _now: datetime) -> None:
+        """Revert optimistic values that were never confirmed."""
+        self._unsub_pending_timeout = None
+        _LOGGER.debug(
+            "Control4 did not confirm %s for %s, reverting",
+            list(self._pending),
+            self.entity_id,
+        )
+        self._pending.clear()
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop optimistic values the director has confirmed."""
+        if self._pending and (item_data := self.coordinator.data.get(self._idx)):
+            for var, (value, tolerance) in list(self._pending.items()):
+                if var in item_data and _value_matches(
+                    item_data[var], value, tolerance
+                ):
+                    del self._pending[var]
+            if not self._pending and self._unsub_pending_timeout:
+                self._unsub_pending_timeout()
+                self._unsub_pending_timeout = None
+        super()._handle_coordinator_update()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the confirmation timeout."""
+        if self._unsub_pending_timeout:
+            self._unsub_pending_timeout()
+            self._unsub_pending_timeout = None
+        await super().async_will_remove_from_hass()
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -205,3 +523,123 @@ class Control4Entity(CoordinatorEntity[Any]):
             name=self._device_name,
             via_device=(DOMAIN, self._controller_unique_id),
         )
+
+
+class Control4PlatformEntities(Generic[_SpecT]):
+    """The entities of a platform, kept in line with the catalog.
+
+    Platforms describe each entity by the spec it is created from. When the
+    catalog changes, entities whose spec changed are recreated, those whose
+    item is gone are removed from the entity registry, and new ones are
+    added, all without reloading the config entry.
+
+    The variables of the platform are polled only for the items of enabled
+    entities. Enabling an entity reloads the config entry, disabling one
+    removes it from the poll right away.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        domain: Platform,
+        coordinator: Control4VariableCoordinator,
+        variable_names: Iterable[str],
+        async_add_entities: AddEntitiesCallback,
+        create: Callable[[_SpecT], Control4Entity],
+    ) -> None:
+        """Initialize the platform entities."""
+        self.hass = hass
+        self._domain = domain
+        self._coordinator = coordinator
+        self._variable_names = frozenset(variable_names)
+        self._async_add_entities = async_add_entities
+        self._create = create
+        self.specs: dict[int, _SpecT] = {}
+        self.entities: dict[int, Control4Entity] = {}
+        self.polled_item_ids: frozenset[int] = frozenset()
+        self._unregister_variables: CALLBACK_TYPE | None = None
+
+    async def async_update(self, specs: dict[int, _SpecT]) -> None:
+        """Add, remove and recreate entities to match the specs."""
+        entity_registry = er.async_get(self.hass)
+        for item_id, spec in list(self.specs.items()):
+            if specs.get(item_id) == spec:
+                continue
+            entity = self.entities.pop(item_id)
+            del self.specs[item_id]
+            if item_id not in specs and (
+                entity_id := entity_registry.async_get_entity_id(
+                    self._domain, DOMAIN, entity.unique_id
+                )
+            ):
+                entity_registry.async_remove(entity_id)
+            elif entity.hass is not None:
+                # The recreated entity takes over the registry entry
+                await entity.async_remove(force_remove=True)
+            # Disabled entities were never added, there is nothing to remove
+
+        added: list[Control4Entity] = []
+        for item_id, spec in specs.items():
+            if item_id in self.specs:
+                continue
+            self.specs[item_id] = spec
+            self.entities[item_id] = entity = self._create(spec)
+            entity.async_on_remove(partial(self._async_entity_removed, entity))
+            added.append(entity)
+
+        self._async_poll(
+            frozenset(
+                item_id
+                for item_id, entity in self.entities.items()
+                if self._is_enabled(entity_registry, entity)
+            )
+        )
+        if added:
+            # Fetch initial data so we have data when entities subscribe
+            await self._coordinator.async_refresh_registered()
+            self._async_add_entities(added, True)
+
+    def _is_enabled(
+        self, entity_registry: er.EntityRegistry, entity: Control4Entity
+    ) -> bool:
+        """Return whether an entity is enabled or will be once added."""
+        if (registry_entry := entity.registry_entry) is None and (
+            entity_id := entity_registry.async_get_entity_id(
+                self._domain, DOMAIN, entity.unique_id
+            )
+        ):
+            registry_entry = entity_registry.async_get(entity_id)
+        if registry_entry is None:
+            return entity.entity_registry_enabled_default
+        return not registry_entry.disabled
+
+    @callback
+    def _async_entity_removed(self, entity: Control4Entity) -> None:
+        """Stop polling the item of an entity that was disabled."""
+        if entity.registry_entry and entity.registry_entry.disabled:
+            self._async_poll(
+                self.polled_item_ids.difference(
+                    item_id
+                    for item_id, polled in self.entities.items()
+                    if polled is entity
+                )
+            )
+
+    @callback
+    def _async_poll(self, item_ids: frozenset[int]) -> None:
+        """Poll the variables of the platform for these items."""
+        if item_ids == self.polled_item_ids and self._unregister_variables:
+            return
+        self.async_stop_polling()
+        self.polled_item_ids = item_ids
+        if item_ids:
+            self._unregister_variables = self._coordinator.async_register_variables(
+                self._variable_names, item_ids=item_ids
+            )
+
+    @callback
+    def async_stop_polling(self) -> None:
+        """Stop polling the variables of the platform."""
+        if self._unregister_variables:
+            self._unregister_variables()
+            self._unregister_variables = None
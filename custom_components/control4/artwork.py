@@ -0,0 +1,139 @@
+"""Caches the artwork of what is playing in Control4 rooms."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import logging
+from time import monotonic
+from typing import NamedTuple
+
+from aiohttp import ClientSession, ClientTimeout, client_exceptions, hdrs
+from yarl import URL
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    ARTWORK_CACHE_MAX_BYTES,
+    ARTWORK_FETCH_TIMEOUT,
+    ARTWORK_REVALIDATE_INTERVAL,
+)
+from .metrics import Control4Metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Artwork(NamedTuple):
+    """An image with the validators to revalidate it."""
+
+    content: bytes
+    content_type: str | None
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
+class Control4ArtworkCache:
+    """Serves now-playing artwork from a size-bounded LRU cache.
+
+    Many rooms often play the same source, and the frontend asks for the
+    image again on every state change. Images are kept until they are the
+    least recently used and the cache exceeds ARTWORK_CACHE_MAX_BYTES, and
+    revalidated with a conditional request once they are older than
+    ARTWORK_REVALIDATE_INTERVAL seconds. Concurrent requests for an image
+    share one download.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        director_host: str,
+        director_session: ClientSession,
+        session: ClientSession,
+        metrics: Control4Metrics,
+    ) -> None:
+        """Initialize the artwork cache."""
+        self.hass = hass
+        self.director_host = director_host
+        # The configured host may carry a port
+        self._director_url = URL(f"//{director_host}")
+        self._director_session = director_session
+        self._session = session
+        self._metrics = metrics
+        self._images: OrderedDict[str, _Artwork] = OrderedDict()
+        self._size = 0
+        self._fetching: dict[str, asyncio.Task[_Artwork | None]] = {}
+
+    async def async_get(self, url: str) -> tuple[bytes | None, str | None]:
+        """Return the image and content type at the URL."""
+        cached = self._images.get(url)
+        if cached and monotonic() - cached.fetched_at < ARTWORK_REVALIDATE_INTERVAL:
+            self._images.move_to_end(url)
+            self._metrics.artwork["hit"] += 1
+            return cached.content, cached.content_type
+
+        if (task := self._fetching.get(url)) is None:
+            task = self._fetching[url] = self.hass.async_create_background_task(
+                self._async_fetch(url, cached), "control4_artwork_fetch"
+            )
+            task.add_done_callback(lambda _: self._fetching.pop(url, None))
+        artwork = await asyncio.shield(task)
+        if artwork is None:
+            return None, None
+        return artwork.content, artwork.content_type
+
+    async def _async_fetch(self, url: str, cached: _Artwork | None) -> _Artwork | None:
+        """Download or revalidate an image, falling back to the cached copy."""
+        headers = {}
+        if cached and cached.etag:
+            headers[hdrs.IF_NONE_MATCH] = cached.etag
+        if cached and cached.last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+        # Artwork served by the controller reuses its kept-alive connections
+        session = (
+            self._director_session if self._is_director_url(URL(url)) else self._session
+        )
+        try:
+            async with session.get(
+                url,
+                headers=headers,
+                timeout=ClientTimeout(total=ARTWORK_FETCH_TIMEOUT),
+            ) as response:
+                if response.status == 304 and cached:
+                    self._metrics.artwork["not_modified"] += 1
+                    artwork = cached._replace(fetched_at=monotonic())
+                else:
+                    response.raise_for_status()
+                    self._metrics.artwork["miss"] += 1
+                    artwork = _Artwork(
+                        await response.read(),
+                        response.headers.get(hdrs.CONTENT_TYPE),
+                        response.headers.get(hdrs.ETAG),
+                        response.headers.get(hdrs.LAST_MODIFIED),
+                        monotonic(),
+                    )
+        except (client_exceptions.ClientError, TimeoutError) as err:
+            _LOGGER.debug("Could not fetch Control4 artwork %s: %s", url, err)
+            self._metrics.artwork["failed"] += 1
+            return cached
+
+        self._store(url, artwork)
+        return artwork
+
+    def _is_director_url(self, url: URL) -> bool:
+        """Return whether the URL points at the controller."""
+        return url.host == self._director_url.host and (
+            self._director_url.port is None or url.port == self._director_url.port
+        )
+
+    def _store(self, url: str, artwork: _Artwork) -> None:
+        """Add an image, evicting the least recently used ones beyond the limit."""
+        if previous := self._images.pop(url, None):
+            self._size -= len(previous.content)
+        if len(artwork.content) > ARTWORK_CACHE_MAX_BYTES:
+            return
+        self._images[url] = artwork
+        self._size += len(artwork.content)
+        while self._size > ARTWORK_CACHE_MAX_BYTES:
+            _, evicted = self._images.popitem(last=False)
+            self._size -= len(evicted.content)
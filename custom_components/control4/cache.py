@@ -0,0 +1,162 @@
+"""Caches the Control4 director item catalog and UI configuration on disk."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+from typing import Any
+
+from aiohttp import client_exceptions
+from pyControl4.director import C4Director
+from pyControl4.error_handling import C4Exception
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util.json import json_loads
+
+from .catalog import compact_items, compact_ui_configuration
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def catalog_fingerprint(director_all_items: str, ui_configuration: str) -> str:
+    """Return a fingerprint of the raw catalog payloads."""
+    digest = hashlib.sha256(director_all_items.encode())
+    digest.update(ui_configuration.encode())
+    return digest.hexdigest()
+
+
+class Control4CatalogCache:
+    """Stores the compacted catalog of a config entry in Home Assistant storage.
+
+    The cache is only used while the director software version matches the
+    one it was saved with, and is revalidated against the director in the
+    background after every warm start.
+
+    The catalog itself is only held until setup has indexed it; afterwards
+    the cache keeps just the version and fingerprint it was saved with.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the catalog cache."""
+        self._store = Store[dict[str, Any]](
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.catalog"
+        )
+        self._loaded: dict[str, Any] | None = None
+        self._director_sw_version: str | None = None
+        self.fingerprint: str | None = None
+
+    async def async_load(self) -> None:
+        """Read the cached catalog from disk."""
+        self._loaded = await self._store.async_load()
+        if self._loaded:
+            self._director_sw_version = self._loaded["director_sw_version"]
+            self.fingerprint = self._loaded["fingerprint"]
+
+    def pop(
+        self, director_sw_version: str
+    ) -> tuple[list[dict[str, Any]], dict[str, Any], str] | None:
+        """Return the loaded items, UI configuration and fingerprint once."""
+        data, self._loaded = self._loaded, None
+        if not data or self._director_sw_version != director_sw_version:
+            return None
+        return data["items"], data["ui_configuration"], data["fingerprint"]
+
+    async def async_save(
+        self,
+        director_sw_version: str,
+        fingerprint: str,
+        director_all_items: list[dict[str, Any]],
+        ui_configuration: dict[str, Any],
+    ) -> None:
+        """Replace the cached catalog."""
+        self._director_sw_version = director_sw_version
+        self.fingerprint = fingerprint
+        await self._store.async_save(
+            {
+                "director_sw_version": director_sw_version,
+                "fingerprint": fingerprint,
+                "items": director_all_items,
+                "ui_configuration": ui_configuration,
+            }
+        )
+
+    async def async_remove(self) -> None:
+        """Delete the cached catalog."""
+        await self._store.async_remove()
+
+
+def _decode_payloads(
+    director_all_items: str, ui_configuration: str
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Decode and compact the raw catalog payloads."""
+    return (
+        compact_items(json_loads(director_all_items)),
+        compact_ui_configuration(json_loads(ui_configuration)),
+    )
+
+
+def _decode_catalog(
+    director_all_items: str, ui_configuration: str
+) -> tuple[list[dict[str, Any]], dict[str, Any], str]:
+    """Decode and compact the raw catalog payloads, and fingerprint them."""
+    return (
+        *_decode_payloads(director_all_items, ui_configuration),
+        catalog_fingerprint(director_all_items, ui_configuration),
+    )
+
+
+async def async_fetch_catalog(
+    hass: HomeAssistant, director: C4Director
+) -> tuple[list[dict[str, Any]], dict[str, Any], str]:
+    """Download the items, UI configuration and fingerprint from the director.
+
+    The payloads of large projects take a while to decode, so they are
+    decoded in the executor. Only the compacted catalog is returned, and the
+    payloads are released.
+    """
+    director_all_items, ui_configuration = await asyncio.gather(
+        director.getAllItemInfo(), director.getUiConfiguration()
+    )
+    return await hass.async_add_executor_job(
+        _decode_catalog, director_all_items, ui_configuration
+    )
+
+
+async def async_revalidate_catalog(
+    hass: HomeAssistant,
+    cache: Control4CatalogCache,
+    director: C4Director,
+    director_sw_version: str,
+) -> tuple[list[dict[str, Any]], dict[str, Any], str] | None:
+    """Return the new catalog if the project changed since it was cached.
+
+    The director has no cheaper indicator of project changes, so both
+    payloads are downloaded in full. Unchanged payloads are recognized by
+    their fingerprint before they are decoded, which skips decoding, saving
+    and updating the entities, but not the download.
+    """
+    try:
+        director_all_items, ui_configuration = await asyncio.gather(
+            director.getAllItemInfo(), director.getUiConfiguration()
+        )
+    except (C4Exception, client_exceptions.ClientError, TimeoutError) as exception:
+        _LOGGER.warning("Could not revalidate cached Control4 catalog: %s", exception)
+        return None
+    fingerprint = await hass.async_add_executor_job(
+        catalog_fingerprint, director_all_items, ui_configuration
+    )
+    if fingerprint == cache.fingerprint:
+        _LOGGER.debug("Cached Control4 catalog is up to date")
+        return None
+
+    _LOGGER.info("Control4 project changed, updating entities from the new catalog")
+    items, ui_configuration = await hass.async_add_executor_job(
+        _decode_payloads, director_all_items, ui_configuration
+    )
+    await cache.async_save(director_sw_version, fingerprint, items, ui_configuration)
+    return items, ui_configuration, fingerprint
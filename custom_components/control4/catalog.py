@@ -0,0 +1,155 @@
+"""Indexes the Control4 director items for platforms."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Item properties used by the platforms, everything else is dropped on ingestion
+ITEM_FIELDS = (
+    "id",
+    "name",
+    "typeName",
+    "type",
+    "parentId",
+    "categories",
+    "manufacturer",
+    "model",
+    "roomHidden",
+)
+# Room experiences that list media sources
+SOURCE_EXPERIENCES = ("listen", "watch")
+
+
+def compact_items(director_all_items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Strip the director items down to the properties the platforms use."""
+    return [
+        {field: item[field] for field in ITEM_FIELDS if field in item}
+        for item in director_all_items
+        if "id" in item
+    ]
+
+
+def compact_ui_configuration(ui_configuration: dict[str, Any]) -> dict[str, Any]:
+    """Strip the UI configuration down to the media sources of each room."""
+    return {
+        "experiences": [
+            {
+                "type": experience["type"],
+                "room_id": experience["room_id"],
+                "sources": {
+                    "source": [
+                        {"id": source["id"]}
+                        for source in experience["sources"]["source"]
+                    ]
+                },
+            }
+            for experience in ui_configuration.get("experiences", ())
+            if experience.get("type") in SOURCE_EXPERIENCES
+        ]
+    }
+
+
+class Control4Item:
+    """The properties of a director item used by the platforms."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "type_name",
+        "type",
+        "parent_id",
+        "categories",
+        "manufacturer",
+        "model",
+        "room_hidden",
+    )
+
+    def __init__(self, item: dict[str, Any]) -> None:
+        """Copy the used properties of a director item."""
+        self.id: int = item["id"]
+        self.name: str | None = item.get("name")
+        self.type_name: str | None = item.get("typeName")
+        self.type: int | None = item.get("type")
+        self.parent_id: int | None = item.get("parentId")
+        self.categories: tuple[str, ...] = tuple(item.get("categories", ()))
+        self.manufacturer: str | None = item.get("manufacturer")
+        self.model: str | None = item.get("model")
+        self.room_hidden: bool = item.get("roomHidden", False)
+
+    def __repr__(self) -> str:
+        """Return the item for logging."""
+        return (
+            f"<Control4Item id={self.id} name={self.name!r}"
+            f" type_name={self.type_name!r} type={self.type}"
+            f" parent_id={self.parent_id}>"
+        )
+
+
+class Control4Experience:
+    """A listen or watch experience of a room and its media sources."""
+
+    __slots__ = ("type", "source_ids")
+
+    def __init__(self, experience: dict[str, Any]) -> None:
+        """Copy the type and source IDs of an experience."""
+        self.type: str = experience["type"]
+        self.source_ids: tuple[int, ...] = tuple(
+            source["id"] for source in experience["sources"]["source"]
+        )
+
+
+class Control4Catalog:
+    """Director items and UI experiences indexed for constant time lookups.
+
+    Built once per config entry so platforms never scan the full item list.
+    Only compact records are kept, not the director payloads.
+    """
+
+    def __init__(
+        self, director_all_items: list[dict[str, Any]], ui_configuration: dict[str, Any]
+    ) -> None:
+        """Build the indexes."""
+        self._items_by_id: dict[int, Control4Item] = {}
+        self._items_by_category: dict[str, list[Control4Item]] = {}
+        self._items_by_type_name: dict[str, list[Control4Item]] = {}
+        self._room_experiences: dict[int, list[Control4Experience]] = {}
+        self.parent_ids: dict[int, int] = {}
+
+        for raw_item in director_all_items:
+            if "id" not in raw_item:
+                continue
+            item = Control4Item(raw_item)
+            self._items_by_id[item.id] = item
+            for category in item.categories:
+                self._items_by_category.setdefault(category, []).append(item)
+            if item.type_name is not None:
+                self._items_by_type_name.setdefault(item.type_name, []).append(item)
+            if item.parent_id is not None and item.id > 1:
+                self.parent_ids[item.id] = item.parent_id
+
+        for experience in ui_configuration.get("experiences", ()):
+            if experience.get("type") not in SOURCE_EXPERIENCES:
+                continue
+            self._room_experiences.setdefault(experience["room_id"], []).append(
+                Control4Experience(experience)
+            )
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self._items_by_id)
+
+    def get(self, item_id: int) -> Control4Item | None:
+        """Return the item with the given ID."""
+        return self._items_by_id.get(item_id)
+
+    def items_of_category(self, category: str) -> list[Control4Item]:
+        """Return all items with the given category."""
+        return self._items_by_category.get(category, [])
+
+    def items_of_type(self, type_name: str) -> list[Control4Item]:
+        """Return all items with the given typeName."""
+        return self._items_by_type_name.get(type_name, [])
+
+    def room_experiences(self, room_id: int) -> list[Control4Experience]:
+        """Return the listen and watch experiences of a room."""
+        return self._room_experiences.get(room_id, [])
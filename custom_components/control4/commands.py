@@ -0,0 +1,127 @@
+"""Sends commands from Control4 entities to the director."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import Any
+
+from .const import COMMAND_MAX_CONCURRENCY, COMMAND_MAX_IN_FLIGHT
+from .metrics import Control4Metrics
+
+Command = Callable[[], Awaitable[Any]]
+
+
+class Control4CommandDispatcher:
+    """Sends the commands of all entities of a config entry.
+
+    Turning off a light group or an area calls every light at once; their
+    commands share at most COMMAND_MAX_CONCURRENCY requests to the director,
+    and on_idle runs once after the last of them has been sent instead of
+    once per light.
+    """
+
+    def __init__(
+        self, metrics: Control4Metrics, on_idle: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Initialize the command dispatcher."""
+        self.metrics = metrics
+        self._on_idle = on_idle
+        self._semaphore = asyncio.Semaphore(COMMAND_MAX_CONCURRENCY)
+        self._active = 0
+
+    @asynccontextmanager
+    async def async_burst(self) -> AsyncIterator[None]:
+        """Hold off on_idle while the commands of a burst are being sent."""
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            if not self._active:
+                await self._on_idle()
+
+    async def async_send(self, kind: str | None, command: Command) -> None:
+        """Send a single command within the concurrency limit."""
+        async with self._semaphore:
+            start = monotonic()
+            try:
+                await command()
+            except Exception:
+                self.metrics.record_command(kind or "other", 0, failed=True)
+                raise
+            self.metrics.record_command(
+                kind or "other", monotonic() - start, failed=False
+            )
+
+
+class Control4CommandCoalescer:
+    """Collapses bursts of same-kind commands for one device to the latest.
+
+    While a command of a kind is being sent, newer commands of that kind
+    replace each other and only the latest one is sent once the director
+    answers; callers of replaced commands return when it has been sent.
+    Commands without a kind, such as relative volume steps, are never
+    replaced. At most COMMAND_MAX_IN_FLIGHT requests are sent to the device
+    at once, through the dispatcher shared by the entry.
+    """
+
+    def __init__(self, dispatcher: Control4CommandDispatcher) -> None:
+        """Initialize the command coalescer."""
+        self._dispatcher = dispatcher
+        self._semaphore = asyncio.Semaphore(COMMAND_MAX_IN_FLIGHT)
+        self._sending: set[str] = set()
+        self._queued: dict[str, tuple[Command, asyncio.Future[None]]] = {}
+
+    async def async_send(self, kind: str | None, command: Command) -> None:
+        """Send a command, replacing a queued command of the same kind."""
+        if kind is not None and kind in self._sending:
+            if kind in self._queued:
+                future = self._queued[kind][1]
+                self._dispatcher.metrics.commands_coalesced[kind] += 1
+            else:
+                future = asyncio.get_running_loop().create_future()
+            self._queued[kind] = (command, future)
+            # A cancelled caller must not cancel the callers it shares with
+            await asyncio.shield(future)
+            return
+
+        async with self._dispatcher.async_burst():
+            if kind is None:
+                await self._async_send(kind, command)
+                return
+            self._sending.add(kind)
+            try:
+                try:
+                    await self._async_send(kind, command)
+                finally:
+                    # Send the latest replacement even if this command failed
+                    while kind in self._queued:
+                        await self._async_send_queued(kind)
+            finally:
+                self._sending.discard(kind)
+                # Release the callers of a replacement that was never sent
+                if queued := self._queued.pop(kind, None):
+                    queued[1].cancel()
+
+    async def _async_send_queued(self, kind: str) -> None:
+        """Send the latest replacement of a kind and notify its callers."""
+        command, future = self._queued.pop(kind)
+        try:
+            await self._async_send(kind, command)
+        except Exception as err:  # pylint: disable=broad-except
+            if not future.done():
+                future.set_exception(err)
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            if not future.done():
+                future.set_result(None)
+
+    async def _async_send(self, kind: str | None, command: Command) -> None:
+        """Send a single command within the in-flight limit of the device."""
+        async with self._semaphore:
+            await self._dispatcher.async_send(kind, command)
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import re
+from urllib.parse import urlparse
 
 from aiohttp.client_exceptions import ClientError
 from pyControl4.account import C4Account
 from pyControl4.director import C4Director
-from pyControl4.error_handling import NotFound, Unauthorized
+from pyControl4.error_handling import C4Exception, NotFound, Unauthorized
 import voluptuous as vol
 
+from homeassistant.components import ssdp
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
 from homeassistant.const import (
     CONF_HOST,
@@ -17,23 +21,37 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
 )
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import aiohttp_client, config_validation as cv
 from homeassistant.helpers.device_registry import format_mac
 
 from .const import (
     CONF_CONTROLLER_UNIQUE_ID,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_IDLE_SCAN_INTERVAL,
+    CONF_PUSH_UPDATES,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_IDLE_SCAN_INTERVAL,
+    DEFAULT_PUSH_UPDATES,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    MIN_FAST_SCAN_INTERVAL,
     MIN_SCAN_INTERVAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# SSDP search target of Control4 directors
+DIRECTOR_SSDP_ST = "c4:director"
+# The USN of a director ends in its controller unique ID, such as
+# c4:director:control4_core5_000FFF123456
+CONTROLLER_UNIQUE_ID_RE = re.compile(r"control4_[^_:\s]+_([0-9A-Fa-f]{12})")
+
 DATA_SCHEMA = vol.Schema(
     {
-        vol.Required(CONF_HOST): str,
+        vol.Optional(CONF_HOST): str,
         vol.Required(CONF_USERNAME): str,
         vol.Required(CONF_PASSWORD): str,
     }
@@ -74,18 +92,97 @@ class Control4Validator:
 
     async def connect_to_director(self) -> bool:
         """Test if we can connect to the local Control4 Director."""
+        if await self._async_probe(self.host):
+            return True
+        _LOGGER.error("Failed to connect to the Control4 controller")
+        return False
+
+    async def find_director(self, hosts: dict[str, str | None]) -> bool:
+        """Find the director of the account among the discovered hosts.
+
+        Hosts map to the controller MAC their SSDP USN carries, if any. The
+        directors are probed at the same time. One whose MAC matches the
+        controller of the account is kept once it accepts the bearer token;
+        the first other director that does is only kept when none of those
+        answers.
+        """
+        mac = _controller_mac(self.controller_unique_id)
+        preferred = {
+            host for host, host_mac in hosts.items() if mac and host_mac == mac
+        }
+        probes = {asyncio.create_task(self._async_probe(host)): host for host in hosts}
+        pending = set(probes)
+        first_responder: str | None = None
         try:
-            director_session = aiohttp_client.async_get_clientsession(
-                self.hass, verify_ssl=False
-            )
-            director = C4Director(
-                self.host, self.director_bearer_token, director_session
-            )
-            await director.getAllItemInfo()
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for probe in done:
+                    if not probe.result():
+                        continue
+                    if (host := probes[probe]) in preferred:
+                        self.host = host
+                        return True
+                    if first_responder is None:
+                        first_responder = host
+                # Keep waiting while the director of the account may answer
+                if first_responder is not None and preferred.isdisjoint(
+                    probes[probe] for probe in pending
+                ):
+                    break
+        finally:
+            for probe in pending:
+                probe.cancel()
+        if first_responder is not None:
+            self.host = first_responder
             return True
-        except (Unauthorized, ClientError, TimeoutError):
-            _LOGGER.error("Failed to connect to the Control4 controller")
+        _LOGGER.error("None of the discovered Control4 controllers answered")
+        return False
+
+    async def _async_probe(self, host: str) -> bool:
+        """Test if the director at the host accepts the bearer token.
+
+        Asking for the controllers category answers with a few items,
+        where the full item info of a large project takes seconds to
+        download.
+        """
+        director_session = aiohttp_client.async_get_clientsession(
+            self.hass, verify_ssl=False
+        )
+        director = C4Director(host, self.director_bearer_token, director_session)
+        try:
+            await director.getAllItemsByCategory("controllers")
+        except (C4Exception, ClientError, TimeoutError) as err:
+            _LOGGER.debug("Control4 controller at %s did not answer: %s", host, err)
             return False
+        return True
+
+
+def _controller_mac(controller_unique_id: str | None) -> str | None:
+    """Return the formatted MAC in a controller unique ID or SSDP USN."""
+    if controller_unique_id and (
+        match := CONTROLLER_UNIQUE_ID_RE.search(controller_unique_id)
+    ):
+        return format_mac(match.group(1))
+    return None
+
+
+async def _async_discovered_hosts(hass: HomeAssistant) -> dict[str, str | None]:
+    """Return the hosts of the directors that answered SSDP searches.
+
+    Each host maps to the controller MAC in its USN, if it carries one.
+    """
+    if ssdp.DOMAIN not in hass.config.components:
+        return {}
+    hosts: dict[str, str | None] = {}
+    for discovery_info in await ssdp.async_get_discovery_info_by_st(
+        hass, DIRECTOR_SSDP_ST
+    ):
+        host = urlparse(discovery_info.ssdp_location or "").hostname
+        if host and hosts.get(host) is None:
+            hosts[host] = _controller_mac(discovery_info.ssdp_usn)
+    return hosts
 
 
 class Control4ConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -93,12 +190,30 @@ class Control4ConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovered_host: str | None = None
+
+    async def async_step_ssdp(self, discovery_info: ssdp.SsdpServiceInfo) -> FlowResult:
+        """Handle a director found with SSDP."""
+        host = urlparse(discovery_info.ssdp_location or "").hostname
+        if not host:
+            return self.async_abort(reason="cannot_connect")
+        if mac := _controller_mac(discovery_info.ssdp_usn):
+            await self.async_set_unique_id(mac)
+            self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+        self._async_abort_entries_match({CONF_HOST: host})
+
+        self._discovered_host = host
+        self.context["title_placeholders"] = {"host": host}
+        return await self.async_step_user()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
         if user_input is not None:
             hub = Control4Validator(
-                user_input[CONF_HOST],
+                user_input.get(CONF_HOST),
                 user_input[CONF_USERNAME],
                 user_input[CONF_PASSWORD],
                 self.hass,
@@ -106,7 +221,12 @@ class Control4ConfigFlow(ConfigFlow, domain=DOMAIN):
             try:
                 if not await hub.authenticate():
                     raise InvalidAuth
-                if not await hub.connect_to_director():
+                if hub.host:
+                    if not await hub.connect_to_director():
+                        raise CannotConnect
+                elif not await hub.find_director(
+                    await _async_discovered_hosts(self.hass)
+                ):
                     raise CannotConnect
             except InvalidAuth:
                 errors["base"] = "invalid_auth"
@@ -125,15 +245,20 @@ class Control4ConfigFlow(ConfigFlow, domain=DOMAIN):
                 return self.async_create_entry(
                     title=controller_unique_id,
                     data={
-                        CONF_HOST: user_input[CONF_HOST],
+                        CONF_HOST: hub.host,
                         CONF_USERNAME: user_input[CONF_USERNAME],
                         CONF_PASSWORD: user_input[CONF_PASSWORD],
                         CONF_CONTROLLER_UNIQUE_ID: controller_unique_id,
                     },
                 )
 
+        data_schema = DATA_SCHEMA
+        if self._discovered_host:
+            data_schema = self.add_suggested_values_to_schema(
+                DATA_SCHEMA, {CONF_HOST: self._discovered_host}
+            )
         return self.async_show_form(
-            step_id="user", data_schema=DATA_SCHEMA, errors=errors
+            step_id="user", data_schema=data_schema, errors=errors
         )
 
     @staticmethod
@@ -165,6 +290,24 @@ class OptionsFlowHandler(OptionsFlow):
                         CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
                 ): vol.All(cv.positive_int, vol.Clamp(min=MIN_SCAN_INTERVAL)),
+                vol.Optional(
+                    CONF_FAST_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Clamp(min=MIN_FAST_SCAN_INTERVAL)),
+                vol.Optional(
+                    CONF_IDLE_SCAN_INTERVAL,
+                    default=self.config_entry.options.get(
+                        CONF_IDLE_SCAN_INTERVAL, DEFAULT_IDLE_SCAN_INTERVAL
+                    ),
+                ): vol.All(cv.positive_int, vol.Clamp(min=MIN_SCAN_INTERVAL)),
+                vol.Optional(
+                    CONF_PUSH_UPDATES,
+                    default=self.config_entry.options.get(
+                        CONF_PUSH_UPDATES, DEFAULT_PUSH_UPDATES
+                    ),
+                ): bool,
             }
         )
         return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -5,14 +5,75 @@ DOMAIN = "control4"
 DEFAULT_SCAN_INTERVAL = 5
 MIN_SCAN_INTERVAL = 1
 
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+DEFAULT_FAST_SCAN_INTERVAL = 0.5
+MIN_FAST_SCAN_INTERVAL = 0.2
+CONF_IDLE_SCAN_INTERVAL = "idle_scan_interval"
+DEFAULT_IDLE_SCAN_INTERVAL = 60
+# Seconds of fast polling after a command or a detected change
+ACTIVE_POLL_WINDOW = 10
+# Seconds to wait for the director to confirm an optimistic state
+COMMAND_CONFIRM_TIMEOUT = 10
+# Seconds between state writes of a light while it transitions
+LIGHT_RAMP_UPDATE_INTERVAL = 1
+# Commands sent to a single device at once
+COMMAND_MAX_IN_FLIGHT = 2
+# Commands sent to the director at once across all devices of an entry
+COMMAND_MAX_CONCURRENCY = 16
+# Connections kept open to the director, enough for a command burst and a poll
+DIRECTOR_MAX_CONNECTIONS = COMMAND_MAX_CONCURRENCY + 2
+# Seconds an idle connection to the director is kept for the next request
+DIRECTOR_KEEPALIVE_TIMEOUT = 60
+# Requests per second sent to the director on average, and in a burst
+DIRECTOR_REQUEST_RATE = 20
+DIRECTOR_REQUEST_BURST = 40
+# Bytes of now-playing artwork kept in memory, and seconds before an image
+# is revalidated with the server or a download is given up
+ARTWORK_CACHE_MAX_BYTES = 8 * 1024 * 1024
+ARTWORK_REVALIDATE_INTERVAL = 300
+ARTWORK_FETCH_TIMEOUT = 10
+# Consecutive failed polls before the director is considered offline, and
+# seconds between probes while it is, doubling up to the maximum
+DIRECTOR_OFFLINE_THRESHOLD = 3
+DIRECTOR_PROBE_INTERVAL = 5
+DIRECTOR_MAX_PROBE_INTERVAL = 300
+# Seconds the last known state is kept, marked stale, while the director is
+# offline before entities become unavailable
+STALE_STATE_GRACE_PERIOD = 300
+ATTR_STALE_SINCE = "stale_since"
+# Seconds before expiry to refresh the director token, and between retries
+TOKEN_REFRESH_MARGIN = 600
+TOKEN_RETRY_INTERVAL = 60
+
+CONF_PUSH_UPDATES = "push_updates"
+DEFAULT_PUSH_UPDATES = True
+# Polling only reconciles missed events while the WebSocket is connected
+PUSH_RECONCILE_INTERVAL = 300
+
 CONF_ACCOUNT = "account"
+CONF_ARTWORK_CACHE = "artwork_cache"
 CONF_DIRECTOR = "director"
+CONF_DIRECTOR_SESSION = "director_session"
 CONF_DIRECTOR_SW_VERSION = "director_sw_version"
 CONF_DIRECTOR_MODEL = "director_model"
-CONF_DIRECTOR_ALL_ITEMS = "director_all_items"
-CONF_UI_CONFIGURATION = "ui_configuration"
+CONF_CATALOG = "catalog"
 CONF_CONTROLLER_UNIQUE_ID = "controller_unique_id"
 
 CONF_CONFIG_LISTENER = "config_listener"
+CONF_COORDINATOR = "coordinator"
+CONF_COMMAND_DISPATCHER = "command_dispatcher"
+CONF_METRICS = "metrics"
+CONF_REQUEST_SCHEDULER = "request_scheduler"
+CONF_TOKEN_MANAGER = "token_manager"
+CONF_WEBSOCKET = "websocket"
+
+# Seconds between checks of the director for project changes. Each check
+# downloads the full catalog; reloading the entry checks right away.
+CATALOG_REFRESH_INTERVAL = 6 * 3600
+# Dispatcher signal sent with the new catalog when the project changed
+SIGNAL_CATALOG_UPDATED = f"{DOMAIN}_catalog_updated_{{}}"
+
+# Poll stagger shared by all config entries, in hass.data
+DATA_POLL_STAGGER = f"{DOMAIN}_poll_stagger"
 
 CONTROL4_ENTITY_TYPE = 7
@@ -0,0 +1,61 @@
+"""Diagnostics support for Control4."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .catalog import Control4Catalog
+from .const import (
+    CONF_CATALOG,
+    CONF_COORDINATOR,
+    CONF_DIRECTOR_MODEL,
+    CONF_DIRECTOR_SW_VERSION,
+    CONF_METRICS,
+    DOMAIN,
+)
+from .director_utils import Control4VariableCoordinator
+from .metrics import Control4Metrics
+
+TO_REDACT = {CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    catalog: Control4Catalog = entry_data[CONF_CATALOG]
+    coordinator: Control4VariableCoordinator = entry_data[CONF_COORDINATOR]
+    metrics: Control4Metrics = entry_data[CONF_METRICS]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "director": {
+            "model": entry_data[CONF_DIRECTOR_MODEL],
+            "sw_version": entry_data[CONF_DIRECTOR_SW_VERSION],
+            "items": len(catalog),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "poll_phase": coordinator.poll_phase,
+            "push_connected": coordinator.scheduler.push_connected,
+            "director_offline": coordinator.breaker.is_open,
+            "stale_since": coordinator.stale_since,
+            "variables": sorted(coordinator.variable_names),
+            "items": len(coordinator.data or {}),
+        },
+        "metrics": metrics.as_dict(),
+    }
@@ -1,20 +1,48 @@
 """Provides data updates from the Control4 controller for platforms."""
 
+import asyncio
 from collections import defaultdict
-from collections.abc import Set
+from collections.abc import Callable, Iterable, Set
+from datetime import datetime, timedelta
+import json
 import logging
+from time import monotonic
 from typing import Any
 
+from aiohttp import ClientSession, client_exceptions
 from pyControl4.account import C4Account
 from pyControl4.director import C4Director
-from pyControl4.error_handling import BadToken
+from pyControl4.error_handling import BadToken, C4Exception, Unauthorized
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client
+from homeassistant.const import CONF_HOST, CONF_TOKEN
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    RANDOM_MICROSECOND_MAX,
+    RANDOM_MICROSECOND_MIN,
+    async_call_later,
+)
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import CONF_ACCOUNT, CONF_CONTROLLER_UNIQUE_ID, CONF_DIRECTOR, DOMAIN
+from .const import (
+    ACTIVE_POLL_WINDOW,
+    CONF_CONTROLLER_UNIQUE_ID,
+    CONF_DIRECTOR,
+    CONF_METRICS,
+    CONF_TOKEN_MANAGER,
+    CONF_WEBSOCKET,
+    DIRECTOR_MAX_PROBE_INTERVAL,
+    DIRECTOR_OFFLINE_THRESHOLD,
+    DIRECTOR_PROBE_INTERVAL,
+    DOMAIN,
+    PUSH_RECONCILE_INTERVAL,
+    STALE_STATE_GRACE_PERIOD,
+    TOKEN_REFRESH_MARGIN,
+    TOKEN_RETRY_INTERVAL,
+)
+from .metrics import Control4Metrics
+from .request_scheduler import Control4Director, Control4RequestScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,43 +51,573 @@ async def _update_variables_for_config_entry(
     hass: HomeAssistant, entry: ConfigEntry, variable_names: Set[str]
 ) -> dict[int, dict[str, Any]]:
     """Retrieve data from the Control4 director."""
-    director: C4Director = hass.data[DOMAIN][entry.entry_id][CONF_DIRECTOR]
-    data = await director.getAllItemVariableValue(variable_names)
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    director: C4Director = entry_data[CONF_DIRECTOR]
+    metrics: Control4Metrics = entry_data[CONF_METRICS]
+    # Requested directly rather than with getAllItemVariableValue to measure
+    # the payload, which is also why an empty response is not an error here
+    start = monotonic()
+    payload = await director.sendGetRequest(
+        f"/api/v1/items/variables?varnames={','.join(sorted(variable_names))}"
+    )
+    received = monotonic()
     result_dict: defaultdict[int, dict[str, Any]] = defaultdict(dict)
-    for item in data:
+    for item in json.loads(payload):
         result_dict[item["id"]][item["varName"]] = item["value"]
+    metrics.record_poll(
+        received - start,
+        len(payload.encode()),
+        len(result_dict),
+        monotonic() - received,
+    )
     return dict(result_dict)
 
 
+def changed_item_ids(
+    old: dict[int, dict[str, Any]], new: dict[int, dict[str, Any]]
+) -> set[int]:
+    """Return the IDs of items whose variables differ between two variable maps."""
+    return {
+        item_id
+        for item_id in old.keys() | new.keys()
+        if (old_vars := old.get(item_id)) is not (new_vars := new.get(item_id))
+        and old_vars != new_vars
+    }
+
+
 async def update_variables_for_config_entry(
     hass: HomeAssistant, entry: ConfigEntry, variable_names: Set[str]
 ) -> dict[int, dict[str, Any]]:
     """Try to Retrieve data from the Control4 director for update_coordinator."""
+    token = hass.data[DOMAIN][entry.entry_id][CONF_TOKEN_MANAGER].token
     try:
         return await _update_variables_for_config_entry(hass, entry, variable_names)
     except BadToken:
         _LOGGER.info("Updating Control4 director token")
-        await refresh_tokens(hass, entry)
+        await refresh_tokens(hass, entry, token)
         return await _update_variables_for_config_entry(hass, entry, variable_names)
 
 
-async def refresh_tokens(hass: HomeAssistant, entry: ConfigEntry):
+async def refresh_tokens(
+    hass: HomeAssistant, entry: ConfigEntry, stale_token: str | None = None
+):
     """Store updated authentication and director tokens in hass.data."""
-    config = entry.data
-    account_session = aiohttp_client.async_get_clientsession(hass)
+    token_manager: Control4TokenManager = hass.data[DOMAIN][entry.entry_id][
+        CONF_TOKEN_MANAGER
+    ]
+    await token_manager.async_refresh(stale_token)
 
-    account = C4Account(config[CONF_USERNAME], config[CONF_PASSWORD], account_session)
-    await account.getAccountBearerToken()
 
-    controller_unique_id = config[CONF_CONTROLLER_UNIQUE_ID]
-    director_token_dict = await account.getDirectorBearerToken(controller_unique_id)
-    director_session = aiohttp_client.async_get_clientsession(hass, verify_ssl=False)
+class Control4TokenManager:
+    """Keeps the director bearer token of a config entry current.
 
-    director = C4Director(
-        config[CONF_HOST], director_token_dict[CONF_TOKEN], director_session
-    )
+    The token is refreshed TOKEN_REFRESH_MARGIN seconds before it expires.
+    Concurrent refresh requests share a single in-flight refresh, and the
+    account and HTTP sessions are reused rather than re-created.
+    """
 
-    _LOGGER.debug("Saving new tokens in hass data")
-    entry_data = hass.data[DOMAIN][entry.entry_id]
-    entry_data[CONF_ACCOUNT] = account
-    entry_data[CONF_DIRECTOR] = director
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        account: C4Account,
+        director_token_dict: dict[str, Any],
+        session: ClientSession,
+        scheduler: Control4RequestScheduler,
+    ) -> None:
+        """Initialize the token manager."""
+        self.hass = hass
+        self._entry = entry
+        self._account = account
+        self._session = session
+        self._scheduler = scheduler
+        self._refresh_task: asyncio.Task[C4Director] | None = None
+        self._unsub_scheduled_refresh: CALLBACK_TYPE | None = None
+        self.director = self._create_director(director_token_dict)
+        self._async_schedule_refresh(director_token_dict["validSeconds"])
+
+    def _create_director(self, director_token_dict: dict[str, Any]) -> C4Director:
+        """Create a director client for the token on the entry's session."""
+        self.token: str = director_token_dict[CONF_TOKEN]
+        return Control4Director(
+            self._entry.data[CONF_HOST], self.token, self._session, self._scheduler
+        )
+
+    async def async_refresh(self, stale_token: str | None = None) -> C4Director:
+        """Refresh the director token, joining a refresh already in progress.
+
+        A request rejected with stale_token, the token it was sent with,
+        uses the current token if it was refreshed since.
+        """
+        if stale_token is not None and stale_token != self.token:
+            return self.director
+        if self._refresh_task is None:
+            self._refresh_task = self.hass.async_create_task(
+                self._async_refresh(), "control4_token_refresh"
+            )
+            # Cleared only once the new director is in place, so callers
+            # arriving until then join this refresh
+            self._refresh_task.add_done_callback(self._async_refresh_done)
+        # Shielded so one cancelled caller does not cancel the shared refresh
+        return await asyncio.shield(self._refresh_task)
+
+    async def _async_refresh(self) -> C4Director:
+        """Fetch a new director token and hand it to every user."""
+        controller_unique_id = self._entry.data[CONF_CONTROLLER_UNIQUE_ID]
+        try:
+            director_token_dict = await self._account.getDirectorBearerToken(
+                controller_unique_id
+            )
+        except Unauthorized:
+            # The account bearer token expired as well
+            await self._account.getAccountBearerToken()
+            director_token_dict = await self._account.getDirectorBearerToken(
+                controller_unique_id
+            )
+
+        _LOGGER.debug("Saving new tokens in hass data")
+        self.director = self._create_director(director_token_dict)
+        entry_data = self.hass.data[DOMAIN][self._entry.entry_id]
+        entry_data[CONF_DIRECTOR] = self.director
+        entry_data[CONF_METRICS].token_refreshes += 1
+        self._async_schedule_refresh(director_token_dict["validSeconds"])
+
+        # The WebSocket subscription is authenticated with the director token
+        # too. Requests waiting for the token do not wait for the reconnect.
+        if push_updater := entry_data.get(CONF_WEBSOCKET):
+            self._entry.async_create_background_task(
+                self.hass,
+                push_updater.async_connect(director_token_dict[CONF_TOKEN]),
+                "control4_websocket_reconnect",
+            )
+        return self.director
+
+    @callback
+    def _async_refresh_done(self, _task: asyncio.Task[C4Director]) -> None:
+        self._refresh_task = None
+
+    @callback
+    def _async_schedule_refresh(self, valid_seconds: float) -> None:
+        """Refresh the token shortly before it expires."""
+        self._async_cancel_scheduled_refresh()
+        self._unsub_scheduled_refresh = async_call_later(
+            self.hass,
+            max(valid_seconds - TOKEN_REFRESH_MARGIN, TOKEN_RETRY_INTERVAL),
+            self._async_scheduled_refresh,
+        )
+
+    async def _async_scheduled_refresh(self, _now: datetime) -> None:
+        """Refresh the token proactively, retrying later on failure."""
+        self._unsub_scheduled_refresh = None
+        _LOGGER.debug("Refreshing Control4 director token before it expires")
+        try:
+            await self.async_refresh()
+        except (C4Exception, client_exceptions.ClientError, TimeoutError) as err:
+            _LOGGER.warning("Failed to refresh Control4 director token: %s", err)
+            self._async_schedule_refresh(TOKEN_REFRESH_MARGIN + TOKEN_RETRY_INTERVAL)
+
+    @callback
+    def _async_cancel_scheduled_refresh(self) -> None:
+        if self._unsub_scheduled_refresh:
+            self._unsub_scheduled_refresh()
+            self._unsub_scheduled_refresh = None
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop refreshing the token."""
+        self._async_cancel_scheduled_refresh()
+
+
+class Control4PollScheduler:
+    """Picks the poll interval based on recent activity.
+
+    Polls every fast_interval seconds for ACTIVE_POLL_WINDOW seconds after a
+    command or detected change, then drops back to scan_interval and doubles
+    the interval on every quiet poll until idle_interval is reached.
+    """
+
+    def __init__(
+        self, fast_interval: float, scan_interval: float, idle_interval: float
+    ) -> None:
+        """Initialize the poll scheduler."""
+        self.push_connected = False
+        self._active_until = 0.0
+        self.set_intervals(fast_interval, scan_interval, idle_interval)
+        # Start out at scan_interval
+        self._interval = 0.0
+
+    def set_intervals(
+        self, fast_interval: float, scan_interval: float, idle_interval: float
+    ) -> None:
+        """Update the floor, normal and ceiling intervals."""
+        self._scan_interval = scan_interval
+        self._fast_interval = min(fast_interval, scan_interval)
+        self._idle_interval = max(idle_interval, scan_interval)
+
+    def note_activity(self) -> None:
+        """Poll fast for a while."""
+        self._active_until = monotonic() + ACTIVE_POLL_WINDOW
+        self._interval = self._fast_interval
+
+    def next_interval(self) -> timedelta:
+        """Return the interval until the next poll."""
+        if self.push_connected:
+            # Pushed events keep the data current, only reconcile occasionally
+            return timedelta(seconds=PUSH_RECONCILE_INTERVAL)
+        if monotonic() < self._active_until:
+            self._interval = self._fast_interval
+        elif self._interval < self._scan_interval:
+            self._interval = self._scan_interval
+        else:
+            self._interval = min(self._interval * 2, self._idle_interval)
+        return timedelta(seconds=self._interval)
+
+
+class Control4CircuitBreaker:
+    """Tracks whether a director stopped answering.
+
+    The circuit opens after DIRECTOR_OFFLINE_THRESHOLD consecutive polls
+    failed to reach the director. While it is open the director is probed
+    every retry interval, starting at DIRECTOR_PROBE_INTERVAL seconds and
+    doubling up to DIRECTOR_MAX_PROBE_INTERVAL, until it answers again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed circuit."""
+        self.failures = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether the director is considered offline."""
+        return self.failures >= DIRECTOR_OFFLINE_THRESHOLD
+
+    def record_failure(self) -> bool:
+        """Count a failure to reach the director, return whether it opened."""
+        self.failures += 1
+        return self.failures == DIRECTOR_OFFLINE_THRESHOLD
+
+    def record_success(self) -> bool:
+        """Note that the director answered, return whether it was open."""
+        was_open = self.is_open
+        self.failures = 0
+        return was_open
+
+    def retry_interval(self) -> timedelta:
+        """Return the interval until the next probe of an open circuit."""
+        doublings = min(self.failures - DIRECTOR_OFFLINE_THRESHOLD, 16)
+        return timedelta(
+            seconds=min(
+                DIRECTOR_PROBE_INTERVAL * 2**doublings, DIRECTOR_MAX_PROBE_INTERVAL
+            )
+        )
+
+
+class Control4VariableCoordinator(DataUpdateCoordinator[dict[int, dict[str, Any]]]):
+    """Polls the variables registered by every platform in a single request.
+
+    Platforms register the variable names they need, optionally limited to
+    the item IDs they care about. Each cycle fetches the union of all
+    registered variables once and keeps only the registered items.
+
+    While the director cannot be reached, the last known variables are kept
+    for STALE_STATE_GRACE_PERIOD seconds with stale_since set to the time of
+    the last successful poll, and polls back off through a circuit breaker.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        scheduler: Control4PollScheduler,
+    ) -> None:
+        """Initialize the hub coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="hub",
+            update_interval=scheduler.next_interval(),
+        )
+        self._entry = entry
+        self.scheduler = scheduler
+        self._registrations: dict[
+            object, tuple[frozenset[str], frozenset[int] | None]
+        ] = {}
+        self._fetched_registrations: frozenset[
+            tuple[frozenset[str], frozenset[int] | None]
+        ] = frozenset()
+        self._refresh_lock = asyncio.Lock()
+        self._notified_data: dict[int, dict[str, Any]] | None = None
+        self._notified_success = True
+        self.poll_phase = self._microsecond
+        self.breaker = Control4CircuitBreaker()
+        self.stale_since: datetime | None = None
+        self._notified_stale_since: datetime | None = None
+        self._last_success = monotonic()
+        self._last_success_time = dt_util.utcnow()
+
+    @property
+    def variable_names(self) -> frozenset[str]:
+        """Return every variable currently registered."""
+        return frozenset().union(
+            *(variables for variables, _ in self._registrations.values())
+        )
+
+    @callback
+    def async_register_variables(
+        self, variable_names: Iterable[str], item_ids: Iterable[int] | None = None
+    ) -> Callable[[], None]:
+        """Register variables to poll, for all items if item_ids is None."""
+        key = object()
+        self._registrations[key] = (
+            frozenset(variable_names),
+            None if item_ids is None else frozenset(item_ids),
+        )
+
+        @callback
+        def unregister() -> None:
+            self._registrations.pop(key, None)
+
+        return unregister
+
+    async def async_refresh_registered(self) -> None:
+        """Refresh unless the current data already covers every registration."""
+        async with self._refresh_lock:
+            if self.data is not None and all(
+                self._is_fetched(registration)
+                for registration in self._registrations.values()
+            ):
+                return
+            await self.async_refresh()
+
+    def _is_fetched(
+        self, registration: tuple[frozenset[str], frozenset[int] | None]
+    ) -> bool:
+        """Return whether the last poll fetched the variables of a registration."""
+        variable_names, item_ids = registration
+        return any(
+            variable_names <= fetched_names
+            and (
+                fetched_ids is None
+                or (item_ids is not None and item_ids <= fetched_ids)
+            )
+            for fetched_names, fetched_ids in self._fetched_registrations
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners whose items changed since the last update.
+
+        Listeners register the item IDs they display as their context. Those
+        without a context, and all listeners when availability changes, are
+        always updated.
+        """
+        previous_data = self._notified_data
+        self._notified_data = self.data
+        if (
+            previous_data is None
+            or self.data is None
+            or self.last_update_success != self._notified_success
+            or self.stale_since != self._notified_stale_since
+        ):
+            self._notified_success = self.last_update_success
+            self._notified_stale_since = self.stale_since
+            super().async_update_listeners()
+            return
+
+        changed = changed_item_ids(previous_data, self.data)
+        if not changed:
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not changed.isdisjoint(context):
+                update_callback()
+
+    def _next_interval(self) -> timedelta:
+        """Return the interval until the next poll or probe."""
+        if self.breaker.is_open:
+            return self.breaker.retry_interval()
+        return self.scheduler.next_interval()
+
+    @callback
+    def async_note_activity(self) -> None:
+        """Poll fast after a command, the next requested refresh picks it up."""
+        self.scheduler.note_activity()
+        self.update_interval = self._next_interval()
+
+    async def async_set_intervals(
+        self, fast_interval: float, scan_interval: float, idle_interval: float
+    ) -> None:
+        """Apply new poll intervals, starting with a poll right away."""
+        self.scheduler.set_intervals(fast_interval, scan_interval, idle_interval)
+        self.update_interval = self._next_interval()
+        await self.async_request_refresh()
+
+    async def async_refresh_after_commands(self) -> None:
+        """Poll fast for a while so the result of commands shows up quickly."""
+        self.async_note_activity()
+        await self.async_request_refresh()
+
+    @callback
+    def async_set_poll_phase(self, phase: float) -> None:
+        """Poll at this fraction of a second from the next scheduled poll on."""
+        # DataUpdateCoordinator polls at a random fraction of a second otherwise
+        self.poll_phase = self._microsecond = phase
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next poll, keeping sub-second intervals.
+
+        DataUpdateCoordinator places the next poll at the poll phase of the
+        current second plus the interval. For sub-second intervals that is
+        often in the past, so polls run back to back, or up to a second
+        late. Those polls are moved to the next time on the grid of the
+        interval through the poll phase instead.
+        """
+        super()._schedule_refresh()
+        interval = self._update_interval_seconds
+        if self._unsub_refresh is None or interval is None or interval >= 1:
+            return
+        loop = self.hass.loop
+        now = loop.time()
+        next_refresh = now + interval - (now - self._microsecond) % interval
+        self._unsub_refresh()
+        self._unsub_refresh = loop.call_at(
+            next_refresh, self.hass.async_run_hass_job, self._job
+        ).cancel
+
+    @callback
+    def async_set_push_connected(self, connected: bool) -> None:
+        """Switch between push reconciliation and adaptive polling."""
+        self.scheduler.push_connected = connected
+        self.update_interval = self._next_interval()
+
+    def is_tracked(self, item_id: int, variable_name: str) -> bool:
+        """Return whether any platform registered the variable for the item."""
+        return any(
+            variable_name in variables and (item_ids is None or item_id in item_ids)
+            for variables, item_ids in self._registrations.values()
+        )
+
+    async def _async_update_data(self) -> dict[int, dict[str, Any]]:
+        """Fetch all registered variables from the Control4 director."""
+        registrations = frozenset(self._registrations.values())
+        variable_names = self.variable_names
+        if not variable_names:
+            return {}
+        entry_data = self.hass.data[DOMAIN][self._entry.entry_id]
+        metrics: Control4Metrics = entry_data[CONF_METRICS]
+        if self.breaker.is_open:
+            # A small request tells whether the director is back before
+            # asking it for every variable
+            try:
+                await entry_data[CONF_DIRECTOR].getAllItemsByCategory("controllers")
+            except C4Exception:
+                pass
+            except (client_exceptions.ClientError, TimeoutError) as err:
+                return self._async_director_unreachable(metrics, err)
+        try:
+            data = await update_variables_for_config_entry(
+                self.hass, self._entry, variable_names
+            )
+        except C4Exception as err:
+            self._async_director_reachable()
+            metrics.record_poll_failure(err)
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        except (client_exceptions.ClientError, TimeoutError) as err:
+            return self._async_director_unreachable(metrics, err)
+        self._async_director_reachable()
+        self._last_success = monotonic()
+        self._last_success_time = dt_util.utcnow()
+        self.stale_since = None
+        self._fetched_registrations = registrations
+
+        # Variables registered for all items are kept as is
+        item_filters: dict[str, set[int] | None] = {}
+        for variables, item_ids in self._registrations.values():
+            for variable in variables:
+                if item_ids is None:
+                    item_filters[variable] = None
+                elif (current := item_filters.setdefault(variable, set())) is not None:
+                    current.update(item_ids)
+
+        result: dict[int, dict[str, Any]] = {}
+        for item_id, item_vars in data.items():
+            kept = {
+                name: value
+                for name, value in item_vars.items()
+                if (allowed := item_filters.get(name, set())) is None
+                or item_id in allowed
+            }
+            if kept:
+                result[item_id] = kept
+
+        if self.data is not None and result != self.data:
+            self.scheduler.note_activity()
+        self.update_interval = self._next_interval()
+        return result
+
+    @callback
+    def _async_director_reachable(self) -> None:
+        """Close the circuit once the director answers again."""
+        if self.breaker.record_success():
+            _LOGGER.info("Control4 director %s is back online", self._entry.title)
+
+    @callback
+    def _async_director_unreachable(
+        self, metrics: Control4Metrics, err: Exception
+    ) -> dict[int, dict[str, Any]]:
+        """Keep the last known variables for a while when a poll fails."""
+        metrics.record_poll_failure(err)
+        if self.breaker.record_failure():
+            metrics.director_outages += 1
+            _LOGGER.warning(
+                "Control4 director %s is unreachable, polling less often until it"
+                " answers: %s",
+                self._entry.title,
+                err,
+            )
+        self.update_interval = self._next_interval()
+        if (
+            self.data is not None
+            and monotonic() - self._last_success < STALE_STATE_GRACE_PERIOD
+        ):
+            self.stale_since = self._last_success_time
+            return self.data
+        self.stale_since = None
+        raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+
+class Control4PollStagger:
+    """Spreads the polls of all Control4 controllers within a second.
+
+    Every coordinator polls at a fixed fraction of a second, whatever its
+    interval. Instead of random fractions that can collide, coordinators
+    get evenly spaced ones, so controllers set up together never poll in
+    the same event loop tick.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the poll stagger."""
+        self._coordinators: list[Control4VariableCoordinator] = []
+
+    @callback
+    def async_add(self, coordinator: Control4VariableCoordinator) -> CALLBACK_TYPE:
+        """Stagger the polls of a coordinator until the returned callback."""
+        self._coordinators.append(coordinator)
+        self._async_spread()
+
+        @callback
+        def remove() -> None:
+            self._coordinators.remove(coordinator)
+            self._async_spread()
+
+        return remove
+
+    @callback
+    def _async_spread(self) -> None:
+        """Space the poll phases evenly over the window Home Assistant uses."""
+        span = RANDOM_MICROSECOND_MAX - RANDOM_MICROSECOND_MIN
+        count = len(self._coordinators)
+        for index, coordinator in enumerate(self._coordinators):
+            coordinator.async_set_poll_phase(
+                (RANDOM_MICROSECOND_MIN + span * index // count) / 10**6
+            )
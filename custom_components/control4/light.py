@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import timedelta
+from collections.abc import Mapping
+from datetime import datetime, timedelta
 import logging
-from typing import Any
+from time import monotonic
+from typing import Any, NamedTuple
 
-from pyControl4.error_handling import C4Exception
+from pyControl4.director import C4Director
 from pyControl4.light import C4Light
+import voluptuous as vol
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
@@ -18,132 +21,197 @@ from homeassistant.components.light import (
     LightEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, entity_platform
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.event import async_track_time_interval
 
-from . import Control4Entity, get_items_of_category
-from .const import CONF_DIRECTOR, CONTROL4_ENTITY_TYPE, DOMAIN
-from .director_utils import update_variables_for_config_entry
+from . import Control4Entity, Control4PlatformEntities
+from .catalog import Control4Catalog
+from .const import (
+    CONF_CATALOG,
+    COMMAND_CONFIRM_TIMEOUT,
+    CONF_COORDINATOR,
+    CONF_DIRECTOR,
+    CONTROL4_ENTITY_TYPE,
+    DOMAIN,
+    LIGHT_RAMP_UPDATE_INTERVAL,
+    SIGNAL_CATALOG_UPDATED,
+)
+from .director_utils import Control4VariableCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 CONTROL4_CATEGORY = "lights"
 CONTROL4_NON_DIMMER_VAR = "LIGHT_STATE"
 CONTROL4_DIMMER_VARS = ["LIGHT_LEVEL", "Brightness Percent"]
+LIGHT_VARIABLES = {CONTROL4_NON_DIMMER_VAR, *CONTROL4_DIMMER_VARS}
 
+SERVICE_SET_LEVEL = "set_level"
+ATTR_LEVEL = "level"
 
-async def async_setup_entry(
-    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
-) -> None:
-    """Set up Control4 lights from a config entry."""
-    entry_data = hass.data[DOMAIN][entry.entry_id]
-    scan_interval = entry_data[CONF_SCAN_INTERVAL]
-    _LOGGER.debug(
-        "Scan interval = %s",
-        scan_interval,
-    )
 
-    async def async_update_data_non_dimmer() -> dict[int, dict[str, Any]]:
-        """Fetch data from Control4 director for non-dimmer lights."""
-        try:
-            return await update_variables_for_config_entry(
-                hass, entry, {CONTROL4_NON_DIMMER_VAR}
-            )
-        except C4Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+class _LightSpec(NamedTuple):
+    """The catalog properties a light entity is created from."""
 
-    async def async_update_data_dimmer() -> dict[int, dict[str, Any]]:
-        """Fetch data from Control4 director for dimmer lights."""
-        try:
-            return await update_variables_for_config_entry(
-                hass, entry, {*CONTROL4_DIMMER_VARS}
-            )
-        except C4Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+    name: str
+    idx: int
+    device_name: str | None
+    device_manufacturer: str | None
+    device_model: str | None
+    device_id: int
+    is_dimmer: bool
 
-    non_dimmer_coordinator = DataUpdateCoordinator[dict[int, dict[str, Any]]](
-        hass,
-        _LOGGER,
-        name="light",
-        update_method=async_update_data_non_dimmer,
-        update_interval=timedelta(seconds=scan_interval),
-    )
-    dimmer_coordinator = DataUpdateCoordinator[dict[int, dict[str, Any]]](
-        hass,
-        _LOGGER,
-        name="light",
-        update_method=async_update_data_dimmer,
-        update_interval=timedelta(seconds=scan_interval),
-    )
 
-    # Fetch initial data so we have data when entities subscribe
-    await non_dimmer_coordinator.async_refresh()
-    await dimmer_coordinator.async_refresh()
+class _Ramp(NamedTuple):
+    """A level transition running on the director."""
 
-    items_of_category = await get_items_of_category(hass, entry, CONTROL4_CATEGORY)
+    start_level: float
+    target_level: float
+    started: float
+    duration: float
 
-    entity_list = []
-    for item in items_of_category:
-        try:
-            if item["type"] == CONTROL4_ENTITY_TYPE:
-                item_name = item["name"]
-                item_id = item["id"]
-                item_parent_id = item["parentId"]
-
-                item_manufacturer = None
-                item_device_name = None
-                item_model = None
-
-                for parent_item in items_of_category:
-                    if parent_item["id"] == item_parent_id:
-                        item_manufacturer = parent_item["manufacturer"]
-                        item_device_name = parent_item["name"]
-                        item_model = parent_item["model"]
-            else:
-                continue
-        except KeyError:
-            _LOGGER.exception(
+    def level_at(self, now: float) -> float:
+        """Return the level the light has reached at a monotonic time."""
+        progress = min((now - self.started) / self.duration, 1)
+        return self.start_level + (self.target_level - self.start_level) * progress
+
+
+def _light_specs(
+    catalog: Control4Catalog,
+    data: dict[int, dict[str, Any]],
+    known_specs: Mapping[int, _LightSpec],
+) -> tuple[dict[int, _LightSpec], dict[int, str]]:
+    """Return the specs of all lights, and the names of lights without state.
+
+    Lights already known keep telling dimmers from switches by their spec
+    when their state is missing, as for disabled lights while the director
+    does not answer, so they are not removed for it.
+    """
+    specs: dict[int, _LightSpec] = {}
+    skipped_lights: dict[int, str] = {}
+    for item in catalog.items_of_category(CONTROL4_CATEGORY):
+        if item.type != CONTROL4_ENTITY_TYPE:
+            continue
+        if item.name is None or item.parent_id is None:
+            _LOGGER.error(
                 "Unknown device properties received from Control4: %s",
                 item,
             )
             continue
+        item_name = item.name
+        item_id = item.id
+        item_parent_id = item.parent_id
+
+        item_manufacturer = None
+        item_device_name = None
+        item_model = None
+
+        parent_item = catalog.get(item_parent_id)
+        if parent_item and CONTROL4_CATEGORY in parent_item.categories:
+            item_manufacturer = parent_item.manufacturer
+            item_device_name = parent_item.name
+            item_model = parent_item.model
 
-        if item_id in dimmer_coordinator.data:
+        item_vars = data.get(item_id, {})
+        if any(var in item_vars for var in CONTROL4_DIMMER_VARS):
             item_is_dimmer = True
-            item_coordinator = dimmer_coordinator
-        elif item_id in non_dimmer_coordinator.data:
+        elif CONTROL4_NON_DIMMER_VAR in item_vars:
             item_is_dimmer = False
-            item_coordinator = non_dimmer_coordinator
+        elif item_id in known_specs:
+            item_is_dimmer = known_specs[item_id].is_dimmer
         else:
-            director = entry_data[CONF_DIRECTOR]
-            item_variables = await director.getItemVariables(item_id)
-            _LOGGER.warning(
-                (
-                    "Couldn't get light state data for %s, skipping setup. Available"
-                    " variables from Control4: %s"
-                ),
-                item_name,
-                item_variables,
-            )
+            skipped_lights[item_id] = item_name
             continue
 
-        entity_list.append(
-            Control4Light(
-                entry_data,
-                item_coordinator,
-                item_name,
-                item_id,
-                item_device_name,
-                item_manufacturer,
-                item_model,
-                item_parent_id,
-                item_is_dimmer,
+        specs[item_id] = _LightSpec(
+            item_name,
+            item_id,
+            item_device_name,
+            item_manufacturer,
+            item_model,
+            item_parent_id,
+            item_is_dimmer,
+        )
+    return specs, skipped_lights
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up Control4 lights from a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: Control4VariableCoordinator = entry_data[CONF_COORDINATOR]
+    lights = Control4PlatformEntities[_LightSpec](
+        hass,
+        Platform.LIGHT,
+        coordinator,
+        LIGHT_VARIABLES,
+        async_add_entities,
+        lambda spec: Control4Light(entry_data, coordinator, *spec),
+    )
+
+    async def async_update_lights(catalog: Control4Catalog) -> None:
+        """Create the light entities of the catalog."""
+        # Every light is fetched once to tell dimmers from switches, only
+        # enabled ones are polled afterwards
+        unregister_all_lights = coordinator.async_register_variables(
+            LIGHT_VARIABLES,
+            item_ids=[item.id for item in catalog.items_of_category(CONTROL4_CATEGORY)],
+        )
+        try:
+            await coordinator.async_refresh_registered()
+            specs, skipped_lights = _light_specs(
+                catalog, coordinator.data or {}, lights.specs
             )
+            await lights.async_update(specs)
+        finally:
+            unregister_all_lights()
+        # Without a successful poll every new light looks like it has no state
+        if skipped_lights and coordinator.last_update_success:
+            await _async_log_skipped_lights(entry_data[CONF_DIRECTOR], skipped_lights)
+
+    await async_update_lights(entry_data[CONF_CATALOG])
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_CATALOG_UPDATED.format(entry.entry_id), async_update_lights
         )
+    )
+    entry.async_on_unload(lights.async_stop_polling)
 
-    async_add_entities(entity_list, True)
+    # Sets many lights, e.g. a whole area, through the shared command dispatcher
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_LEVEL,
+        {
+            vol.Required(ATTR_LEVEL): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=100)
+            ),
+            vol.Optional(ATTR_TRANSITION, default=0): cv.positive_float,
+        },
+        "async_set_level",
+    )
+
+
+async def _async_log_skipped_lights(
+    director: C4Director, skipped_lights: dict[int, str]
+) -> None:
+    """Log the variables of lights that were skipped for missing state."""
+    all_item_variables = await asyncio.gather(
+        *(director.getItemVariables(item_id) for item_id in skipped_lights),
+        return_exceptions=True,
+    )
+    for item_name, item_variables in zip(skipped_lights.values(), all_item_variables):
+        _LOGGER.warning(
+            (
+                "Couldn't get light state data for %s, skipping setup. Available"
+                " variables from Control4: %s"
+            ),
+            item_name,
+            item_variables,
+        )
 
 
 class Control4Light(Control4Entity, LightEntity):
@@ -154,7 +222,7 @@ class Control4Light(Control4Entity, LightEntity):
     def __init__(
         self,
         entry_data: dict,
-        coordinator: DataUpdateCoordinator[dict[int, dict[str, Any]]],
+        coordinator: Control4VariableCoordinator,
         name: str,
         idx: int,
         device_name: str | None,
@@ -175,6 +243,8 @@ class Control4Light(Control4Entity, LightEntity):
             device_id,
         )
         self._is_dimmer = is_dimmer
+        self._ramp: _Ramp | None = None
+        self._unsub_ramp: CALLBACK_TYPE | None = None
         if is_dimmer:
             self._attr_color_mode = ColorMode.BRIGHTNESS
             self._attr_supported_color_modes = {ColorMode.BRIGHTNESS}
@@ -190,22 +260,32 @@ class Control4Light(Control4Entity, LightEntity):
         return C4Light(self.entry_data[CONF_DIRECTOR], self._idx)
 
     @property
-    def is_on(self):
-        """Return whether this light is on or off."""
+    def _level_var(self) -> str:
+        """Return the variable reporting the level of this light."""
         if self._is_dimmer:
             for var in CONTROL4_DIMMER_VARS:
                 if var in self.coordinator.data[self._idx]:
-                    return self.coordinator.data[self._idx][var] > 0
+                    return var
             raise RuntimeError("Dimmer Variable Not Found")
-        return self.coordinator.data[self._idx][CONTROL4_NON_DIMMER_VAR] > 0
+        return CONTROL4_NON_DIMMER_VAR
+
+    @property
+    def _level(self) -> float:
+        """Return the level, interpolated along a running transition."""
+        if self._ramp is not None:
+            return self._ramp.level_at(monotonic())
+        return self._item_data[self._level_var]
+
+    @property
+    def is_on(self):
+        """Return whether this light is on or off."""
+        return self._level > 0
 
     @property
     def brightness(self):
         """Return the brightness of this light between 0..255."""
         if self._is_dimmer:
-            for var in CONTROL4_DIMMER_VARS:
-                if var in self.coordinator.data[self._idx]:
-                    return round(self.coordinator.data[self._idx][var] * 2.55)
+            return round(self._level * 2.55)
         return None
 
     @property
@@ -215,9 +295,86 @@ class Control4Light(Control4Entity, LightEntity):
             return LightEntityFeature.TRANSITION
         return LightEntityFeature(0)
 
+    async def _async_set_level(self, level: float, transition_length: float) -> None:
+        """Show the level until it is confirmed and send it to the director.
+
+        Rapid level changes, e.g. from a brightness slider, are coalesced so
+        only the latest one is sent.
+        """
+        if not self._is_dimmer:
+            await self._async_send_expecting(
+                "level",
+                lambda: self._create_api_object().setLevel(level),
+                {self._level_var: int(level > 0)},
+            )
+            return
+
+        self._async_start_ramp(level, transition_length / 1000)
+        try:
+            await self._async_send_expecting(
+                "level",
+                lambda: self._create_api_object().rampToLevel(level, transition_length),
+                {self._level_var: level},
+                tolerance=1,
+                timeout=transition_length / 1000 + COMMAND_CONFIRM_TIMEOUT,
+            )
+        except Exception:
+            self._async_stop_ramp()
+            self.async_write_ha_state()
+            raise
+
+    @callback
+    def _async_start_ramp(self, level: float, duration: float) -> None:
+        """Show a transition progressing instead of jumping to its end.
+
+        The director reports the level once the transition is done, so the
+        state is interpolated locally and written every
+        LIGHT_RAMP_UPDATE_INTERVAL seconds until then.
+        """
+        start_level = self._level
+        self._async_stop_ramp()
+        if duration <= 0 or start_level == level:
+            return
+        self._ramp = _Ramp(start_level, level, monotonic(), duration)
+        self._unsub_ramp = async_track_time_interval(
+            self.hass,
+            self._async_ramp_step,
+            timedelta(seconds=min(LIGHT_RAMP_UPDATE_INTERVAL, duration)),
+        )
+
+    @callback
+    def _async_ramp_step(self, _now: datetime) -> None:
+        """Write the interpolated level, reconciling when the ramp ends."""
+        if self._ramp is not None and (
+            monotonic() - self._ramp.started >= self._ramp.duration
+        ):
+            self._async_stop_ramp()
+            # Confirm the final level now instead of waiting for the next poll
+            if self._level_var in self._pending:
+                self.hass.async_create_task(self.coordinator.async_request_refresh())
+        self.async_write_ha_state()
+
+    @callback
+    def _async_stop_ramp(self) -> None:
+        self._ramp = None
+        if self._unsub_ramp:
+            self._unsub_ramp()
+            self._unsub_ramp = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop showing a running transition."""
+        self._async_stop_ramp()
+        await super().async_will_remove_from_hass()
+
+    async def async_set_level(self, level: float, transition: float) -> None:
+        """Set the level in percent, ramping over transition seconds."""
+        if self._is_dimmer:
+            await self._async_set_level(level, transition * 1000)
+        else:
+            await self._async_set_level(100 if level > 0 else 0, 0)
+
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
-        c4_light = self._create_api_object()
         if self._is_dimmer:
             if ATTR_TRANSITION in kwargs:
                 transition_length = kwargs[ATTR_TRANSITION] * 1000
@@ -227,32 +384,14 @@ class Control4Light(Control4Entity, LightEntity):
                 brightness = (kwargs[ATTR_BRIGHTNESS] / 255) * 100
             else:
                 brightness = 100
-            await c4_light.rampToLevel(brightness, transition_length)
+            await self._async_set_level(brightness, transition_length)
         else:
-            transition_length = 0
-            await c4_light.setLevel(100)
-        if transition_length == 0:
-            transition_length = 1000
-        delay_time = (transition_length / 1000) + 0.7
-        _LOGGER.debug("Delaying light update by %s seconds", delay_time)
-        await asyncio.sleep(delay_time)
-        await self.coordinator.async_request_refresh()
+            await self._async_set_level(100, 0)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
-        c4_light = self._create_api_object()
-        if self._is_dimmer:
-            if ATTR_TRANSITION in kwargs:
-                transition_length = kwargs[ATTR_TRANSITION] * 1000
-            else:
-                transition_length = 0
-            await c4_light.rampToLevel(0, transition_length)
+        if self._is_dimmer and ATTR_TRANSITION in kwargs:
+            transition_length = kwargs[ATTR_TRANSITION] * 1000
         else:
             transition_length = 0
-            await c4_light.setLevel(0)
-        if transition_length == 0:
-            transition_length = 1500
-        delay_time = (transition_length / 1000) + 0.7
-        _LOGGER.debug("Delaying light update by %s seconds", delay_time)
-        await asyncio.sleep(delay_time)
-        await self.coordinator.async_request_refresh()
+        await self._async_set_level(0, transition_length)
@@ -1,12 +1,12 @@
 """Platform for Control4 Rooms Media Players."""
 from __future__ import annotations
 
-from datetime import timedelta
+from dataclasses import dataclass
 import enum
+from functools import partial
 import logging
-from typing import Any
+from typing import Any, NamedTuple
 
-from pyControl4.error_handling import C4Exception
 from pyControl4.room import C4Room
 
 from homeassistant.components.media_player import (
@@ -17,14 +17,23 @@ from homeassistant.components.media_player import (
     MediaType,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from . import Control4Entity
-from .const import CONF_DIRECTOR, CONF_DIRECTOR_ALL_ITEMS, CONF_UI_CONFIGURATION, DOMAIN
-from .director_utils import update_variables_for_config_entry
+from . import Control4Entity, Control4PlatformEntities
+from .artwork import Control4ArtworkCache
+from .catalog import Control4Catalog
+from .const import (
+    CONF_ARTWORK_CACHE,
+    CONF_CATALOG,
+    CONF_COORDINATOR,
+    CONF_DIRECTOR,
+    DOMAIN,
+    SIGNAL_CATALOG_UPDATED,
+)
+from .director_utils import Control4VariableCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,14 +46,15 @@ CONTROL4_PAUSED = "PAUSED"
 CONTROL4_STOPPED = "STOPPED"
 CONTROL4_MEDIA_INFO = "CURRENT MEDIA INFO"
 
-CONTROL4_PARENT_ID = "parentId"
-
-VARIABLES_OF_INTEREST = {
+ROOM_VARIABLES = {
     CONTROL4_POWER_STATE,
     CONTROL4_VOLUME_STATE,
     CONTROL4_MUTED_STATE,
     CONTROL4_CURRENT_VIDEO_DEVICE,
     CONTROL4_MEDIA_INFO,
+}
+
+SOURCE_VARIABLES = {
     CONTROL4_PLAYING,
     CONTROL4_PAUSED,
     CONTROL4_STOPPED,
@@ -56,117 +66,291 @@ class _SourceType(enum.Enum):
     VIDEO = 2
 
 
+@dataclass
 class _RoomSource:
     """Room Source Data."""
 
-    def __init__(self, source_type: set[_SourceType], idx: int, name: str) -> None:
-        """Initialize Room Source Data."""
-        self.source_type = source_type
-        self.idx = idx
-        self.name = name
+    source_type: set[_SourceType]
+    idx: int
+    name: str
 
 
-async def get_rooms(hass: HomeAssistant, entry: ConfigEntry):
-    """Return a list of all Control4 rooms."""
-    director_all_items = hass.data[DOMAIN][entry.entry_id][CONF_DIRECTOR_ALL_ITEMS]
-    return [
-        item
-        for item in director_all_items
-        if "typeName" in item and item["typeName"] == "room"
-    ]
+class _RoomSpec(NamedTuple):
+    """The catalog properties a room entity is created from."""
 
+    name: str
+    idx: int
+    sources: dict[int, _RoomSource]
+    room_hidden: bool
 
-async def async_setup_entry(
-    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
-) -> None:
-    """Set up Control4 rooms from a config entry."""
-    all_rooms = await get_rooms(hass, entry)
-    if not all_rooms:
-        return
 
-    entry_data = hass.data[DOMAIN][entry.entry_id]
-    scan_interval = entry_data[CONF_SCAN_INTERVAL]
-    _LOGGER.debug("Scan interval = %s", scan_interval)
-
-    async def async_update_data() -> dict[int, dict[str, Any]]:
-        """Fetch data from Control4 director."""
-        try:
-            return await update_variables_for_config_entry(
-                hass, entry, VARIABLES_OF_INTEREST
-            )
-        except C4Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+class _NowPlaying(NamedTuple):
+    """Metadata of what is playing in a room, parsed from its media info."""
 
-    coordinator = DataUpdateCoordinator[dict[int, dict[str, Any]]](
-        hass,
-        _LOGGER,
-        name="room",
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=scan_interval),
+    artist: str | None
+    album: str | None
+    image_url: str | None
+    duration: float | None
+
+
+_NOTHING_PLAYING = _NowPlaying(None, None, None, None)
+
+
+def _parse_duration(duration: Any) -> float | None:
+    """Return a duration given in seconds or as [hh:]mm:ss in seconds."""
+    if isinstance(duration, int | float):
+        return float(duration) if duration > 0 else None
+    if not isinstance(duration, str) or not duration:
+        return None
+    try:
+        seconds = 0.0
+        for part in duration.split(":"):
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        return None
+    return seconds or None
+
+
+def _parse_now_playing(media_info: dict[str, Any], director_host: str) -> _NowPlaying:
+    """Parse the metadata of the media info variable of a room."""
+    image_url = media_info.get("img") or None
+    if isinstance(image_url, str) and image_url.startswith("/"):
+        # Artwork served by the controller itself
+        image_url = f"http://{director_host}{image_url}"
+    elif not isinstance(image_url, str) or not image_url.startswith(
+        ("http://", "https://")
+    ):
+        image_url = None
+    return _NowPlaying(
+        media_info.get("artist") or None,
+        media_info.get("album") or None,
+        image_url,
+        _parse_duration(media_info.get("duration")),
     )
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_refresh()
 
-    items_by_id = {
-        item["id"]: item
-        for item in hass.data[DOMAIN][entry.entry_id][CONF_DIRECTOR_ALL_ITEMS]
-    }
-    item_to_parent_map = {
-        k: item["parentId"]
-        for k, item in items_by_id.items()
-        if "parentId" in item and k > 1
-    }
+class _RoomSnapshot(NamedTuple):
+    """Room state derived from one coordinator update."""
 
-    ui_config = entry_data[CONF_UI_CONFIGURATION]
+    state: MediaPlayerState | None
+    source_state: MediaPlayerState | None
+    source: str | None
+    media_title: str | None
+    media_content_type: MediaType | None
+    now_playing: _NowPlaying
 
-    entity_list = []
-    for room in all_rooms:
-        room_id = room["id"]
 
-        sources: dict[int, _RoomSource] = {}
-        for exp in ui_config["experiences"]:
-            if room_id == exp["room_id"]:
-                exp_type = exp["type"]
-                if exp_type not in ("listen", "watch"):
-                    continue
+# Until the director reports the room, or while it cannot be reached
+_UNAVAILABLE = _RoomSnapshot(None, None, None, None, None, _NOTHING_PLAYING)
 
-                dev_type = (
-                    _SourceType.AUDIO if exp_type == "listen" else _SourceType.VIDEO
-                )
-                for source in exp["sources"]["source"]:
-                    dev_id = source["id"]
-                    name = items_by_id.get(dev_id, {}).get(
-                        "name", f"Unknown Device - {dev_id}"
-                    )
-                    if dev_id in sources:
-                        sources[dev_id].source_type.add(dev_type)
-                    else:
-                        sources[dev_id] = _RoomSource(
-                            source_type={dev_type}, idx=dev_id, name=name
-                        )
-
-        try:
-            hidden = room["roomHidden"]
-            entity_list.append(
-                Control4Room(
-                    entry_data,
-                    coordinator,
-                    room["name"],
-                    room_id,
-                    item_to_parent_map,
-                    sources,
-                    hidden,
-                )
+
+class _SourceStates:
+    """Playback state of source devices, shared by all rooms.
+
+    The state of a device is resolved by walking up its parents at most once
+    per coordinator update, however many rooms it is playing in.
+    """
+
+    def __init__(
+        self, coordinator: Control4VariableCoordinator, id_to_parent: dict[int, int]
+    ) -> None:
+        """Initialize the source state cache."""
+        self._coordinator = coordinator
+        self._id_to_parent = id_to_parent
+        self._data: dict[int, dict[str, Any]] | None = None
+        self._states: dict[int, MediaPlayerState | None] = {}
+
+    def set_parents(self, id_to_parent: dict[int, int]) -> None:
+        """Replace the parents of all items, after the catalog changed."""
+        self._id_to_parent.clear()
+        self._id_to_parent.update(id_to_parent)
+        self._data = None
+
+    def get(self, device_id: int) -> MediaPlayerState | None:
+        """Return the playback state of a device or its nearest parent."""
+        data = self._coordinator.data
+        if data is not self._data:
+            self._data = data
+            self._states = {}
+        elif device_id in self._states:
+            return self._states[device_id]
+
+        state = None
+        current_source: int | None = device_id
+        while current_source:
+            if current_data := data.get(current_source):
+                if current_data.get(CONTROL4_PLAYING, None):
+                    state = MediaPlayerState.PLAYING
+                    break
+                if current_data.get(CONTROL4_PAUSED, None):
+                    state = MediaPlayerState.PAUSED
+                    break
+                if current_data.get(CONTROL4_STOPPED, None):
+                    state = MediaPlayerState.ON
+                    break
+            current_source = self._id_to_parent.get(current_source, None)
+        self._states[device_id] = state
+        return state
+
+
+def _get_media_info(room_data: dict[str, Any]) -> dict | None:
+    """Return the media info of a room, if populated."""
+    media_info = room_data.get(CONTROL4_MEDIA_INFO)
+    if isinstance(media_info, dict) and "mediainfo" in media_info:
+        return media_info["mediainfo"]
+    return None
+
+
+def _get_playing_device_id(media_info: dict | None) -> int | None:
+    """Return the device playing according to the media info of a room."""
+    if media_info:
+        if "medSrcDev" in media_info:
+            return media_info["medSrcDev"]
+        if "deviceid" in media_info:
+            return media_info["deviceid"]
+    return 0
+
+
+class _ActiveSources:
+    """Polls playback state only along the source chains of rooms that are on.
+
+    Playback state is read from the device playing in a room or its nearest
+    parent reporting one. Instead of polling it for every item, it is polled
+    for those devices and their parents in powered on rooms, updated after
+    each poll.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: Control4VariableCoordinator,
+        rooms: Control4PlatformEntities[_RoomSpec],
+        id_to_parent: dict[int, int],
+    ) -> None:
+        """Initialize the active source tracker."""
+        self.hass = hass
+        self._coordinator = coordinator
+        self._rooms = rooms
+        self._id_to_parent = id_to_parent
+        self.device_ids: frozenset[int] = frozenset()
+        self._unregister_variables: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_update(self) -> None:
+        """Poll the source chains of the rooms that are on right now."""
+        data = self._coordinator.data or {}
+        device_ids: set[int] = set()
+        for room_id in self._rooms.polled_item_ids:
+            if not (room_data := data.get(room_id)) or not room_data.get(
+                CONTROL4_POWER_STATE
+            ):
+                continue
+            device_id = _get_playing_device_id(_get_media_info(room_data))
+            while device_id and device_id not in device_ids:
+                device_ids.add(device_id)
+                device_id = self._id_to_parent.get(device_id)
+
+        if device_ids == self.device_ids:
+            return
+        started = not self.device_ids.issuperset(device_ids)
+        self.async_stop_polling()
+        self.device_ids = frozenset(device_ids)
+        if device_ids:
+            self._unregister_variables = self._coordinator.async_register_variables(
+                SOURCE_VARIABLES, item_ids=device_ids
             )
-        except KeyError:
-            _LOGGER.exception(
+        # Show the playback state of a source as soon as a room turns on
+        if started:
+            self.hass.async_create_task(self._coordinator.async_refresh_registered())
+
+    @callback
+    def async_stop_polling(self) -> None:
+        """Stop polling playback state."""
+        if self._unregister_variables:
+            self._unregister_variables()
+            self._unregister_variables = None
+
+
+def _room_specs(catalog: Control4Catalog) -> dict[int, _RoomSpec]:
+    """Return the specs of all rooms and their media sources."""
+    specs: dict[int, _RoomSpec] = {}
+    for room in catalog.items_of_type("room"):
+        if room.name is None:
+            _LOGGER.error(
                 "Unknown device properties received from Control4: %s",
                 room,
             )
             continue
 
-    async_add_entities(entity_list, True)
+        sources: dict[int, _RoomSource] = {}
+        for exp in catalog.room_experiences(room.id):
+            dev_type = _SourceType.AUDIO if exp.type == "listen" else _SourceType.VIDEO
+            for dev_id in exp.source_ids:
+                if dev_id in sources:
+                    sources[dev_id].source_type.add(dev_type)
+                    continue
+                device = catalog.get(dev_id)
+                name = (
+                    device.name
+                    if device and device.name is not None
+                    else f"Unknown Device - {dev_id}"
+                )
+                sources[dev_id] = _RoomSource(
+                    source_type={dev_type}, idx=dev_id, name=name
+                )
+
+        specs[room.id] = _RoomSpec(room.name, room.id, sources, room.room_hidden)
+    return specs
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up Control4 rooms from a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: Control4VariableCoordinator = entry_data[CONF_COORDINATOR]
+
+    # Shared by all rooms, and updated in place when the catalog changes
+    id_to_parent: dict[int, int] = {}
+    source_states = _SourceStates(coordinator, id_to_parent)
+    rooms = Control4PlatformEntities[_RoomSpec](
+        hass,
+        Platform.MEDIA_PLAYER,
+        coordinator,
+        ROOM_VARIABLES,
+        async_add_entities,
+        lambda spec: Control4Room(
+            entry_data,
+            coordinator,
+            spec.name,
+            spec.idx,
+            id_to_parent,
+            source_states,
+            spec.sources,
+            spec.room_hidden,
+        ),
+    )
+    active_sources = _ActiveSources(hass, coordinator, rooms, id_to_parent)
+
+    async def async_update_rooms(catalog: Control4Catalog) -> None:
+        """Create the room entities of the catalog."""
+        source_states.set_parents(catalog.parent_ids)
+        await rooms.async_update(_room_specs(catalog))
+        active_sources.async_update()
+        await coordinator.async_refresh_registered()
+        # Sources of unchanged rooms may have moved to other parents
+        for room in rooms.entities.values():
+            room.async_watch_sources()
+
+    await async_update_rooms(entry_data[CONF_CATALOG])
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_CATALOG_UPDATED.format(entry.entry_id), async_update_rooms
+        )
+    )
+    entry.async_on_unload(coordinator.async_add_listener(active_sources.async_update))
+    entry.async_on_unload(active_sources.async_stop_polling)
+    entry.async_on_unload(rooms.async_stop_polling)
 
 
 class Control4Room(Control4Entity, MediaPlayerEntity):
@@ -178,10 +362,11 @@ class Control4Room(Control4Entity, MediaPlayerEntity):
     def __init__(
         self,
         entry_data: dict,
-        coordinator: DataUpdateCoordinator[dict[int, dict[str, Any]]],
+        coordinator: Control4VariableCoordinator,
         name: str,
         idx: int,
         id_to_parent: dict[int, int],
+        source_states: _SourceStates,
         sources: dict[int, _RoomSource],
         room_hidden: bool,
     ) -> None:
@@ -198,7 +383,14 @@ class Control4Room(Control4Entity, MediaPlayerEntity):
         )
         self._attr_entity_registry_enabled_default = not room_hidden
         self._id_to_parent = id_to_parent
+        self._source_states = source_states
         self._sources = sources
+        self._snapshot: _RoomSnapshot | None = None
+        self._artwork: Control4ArtworkCache = entry_data[CONF_ARTWORK_CACHE]
+        # Parsed again only when the media info of the room changes
+        self._media_info: dict[str, Any] | None = None
+        self._now_playing = _NOTHING_PLAYING
+        self.async_watch_sources()
         self._is_soft_on = False
         self._attr_supported_features = (
             MediaPlayerEntityFeature.PLAY
@@ -219,9 +411,88 @@ class Control4Room(Control4Entity, MediaPlayerEntity):
         """
         return C4Room(self.entry_data[CONF_DIRECTOR], self._idx)
 
+    @callback
+    def async_watch_sources(self) -> None:
+        """Update this room when its sources or any of their parents change."""
+        for source_id in self._sources:
+            self._watch_source_chain(source_id)
+
+    def _watch_source_chain(self, device_id: int | None) -> None:
+        """Update this room when a device or any of its parents change."""
+        while device_id and device_id not in self.coordinator_context:
+            self.coordinator_context.add(device_id)
+            device_id = self._id_to_parent.get(device_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Also watch devices playing in the room that are not listed sources."""
+        if self._idx in self.coordinator.data:
+            self._watch_source_chain(self._get_current_playing_device_id())
+        super()._handle_coordinator_update()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Derive the room state again from the latest data when it is written."""
+        self._snapshot = None
+        super().async_write_ha_state()
+
+    def _get_snapshot(self) -> _RoomSnapshot:
+        """Return the room state, deriving it once per update."""
+        if self._snapshot is None:
+            self._snapshot = self._build_snapshot()
+        return self._snapshot
+
+    def _build_snapshot(self) -> _RoomSnapshot:
+        """Derive the room state from the room and source variables."""
+        if not self.available:
+            return _UNAVAILABLE
+        item_data = self._item_data
+        powered_on = bool(item_data.get(CONTROL4_POWER_STATE))
+        # The director may keep reporting the media of a room it turned off
+        media_info = self._get_media_info() if powered_on else None
+        current_source = _get_playing_device_id(media_info)
+        source_state = (
+            self._source_states.get(current_source) if current_source else None
+        )
+
+        if source_state:
+            state = source_state
+        elif powered_on:
+            state = MediaPlayerState.ON
+        elif self._is_soft_on:
+            state = MediaPlayerState.IDLE
+        else:
+            state = MediaPlayerState.OFF
+
+        source = None
+        if current_source and current_source in self._sources:
+            source = self._sources[current_source].name
+
+        media_title = None
+        now_playing = _NOTHING_PLAYING
+        if media_info:
+            media_title = media_info.get("title", source)
+            if media_info != self._media_info:
+                self._media_info = media_info
+                self._now_playing = _parse_now_playing(
+                    media_info, self._artwork.director_host
+                )
+            now_playing = self._now_playing
+
+        media_content_type = None
+        if current_source:
+            if current_source == self._get_current_video_device_id():
+                media_content_type = MediaType.VIDEO
+            else:
+                media_content_type = MediaType.MUSIC
+
+        return _RoomSnapshot(
+            state, source_state, source, media_title, media_content_type, now_playing
+        )
+
     def _get_device_from_variable(self, var: str) -> int | None:
-        current_device = self.coordinator.data[self._idx][var]
-        if current_device == 0:
+        current_device = self._item_data.get(var)
+        if not current_device:
             return None
 
         return current_device
@@ -230,34 +501,11 @@ class Control4Room(Control4Entity, MediaPlayerEntity):
         return self._get_device_from_variable(CONTROL4_CURRENT_VIDEO_DEVICE)
 
     def _get_current_playing_device_id(self) -> int | None:
-        media_info = self._get_media_info()
-        if media_info:
-            if "medSrcDev" in media_info:
-                return media_info["medSrcDev"]
-            if "deviceid" in media_info:
-                return media_info["deviceid"]
-        return 0
+        return _get_playing_device_id(self._get_media_info())
 
     def _get_media_info(self) -> dict | None:
         """Get the Media Info Dictionary if populated."""
-        media_info = self.coordinator.data[self._idx][CONTROL4_MEDIA_INFO]
-        if "mediainfo" in media_info:
-            return media_info["mediainfo"]
-        return None
-
-    def _get_current_source_state(self) -> str | None:
-        current_source = self._get_current_playing_device_id()
-        while current_source:
-            current_data = self.coordinator.data.get(current_source, None)
-            if current_data:
-                if current_data.get(CONTROL4_PLAYING, None):
-                    return MediaPlayerState.PLAYING
-                if current_data.get(CONTROL4_PAUSED, None):
-                    return MediaPlayerState.PAUSED
-                if current_data.get(CONTROL4_STOPPED, None):
-                    return MediaPlayerState.ON
-            current_source = self._id_to_parent.get(current_source, None)
-        return None
+        return _get_media_info(self._item_data)
 
     @property
     def device_class(self) -> MediaPlayerDeviceClass | None:
@@ -270,48 +518,48 @@ class Control4Room(Control4Entity, MediaPlayerEntity):
     @property
     def state(self):
         """Return whether this room is on or off."""
-
-        if source_state := self._get_current_source_state():
-            return source_state
-
-        if self.coordinator.data[self._idx][CONTROL4_POWER_STATE]:
-            return MediaPlayerState.ON
-
-        if self._is_soft_on:
-            return MediaPlayerState.IDLE
-
-        return MediaPlayerState.OFF
+        return self._get_snapshot().state
 
     @property
     def source(self):
         """Get the current source."""
-        current_source = self._get_current_playing_device_id()
-        if not current_source or current_source not in self._sources:
-            return None
-        return self._sources[current_source].name
+        return self._get_snapshot().source
 
     @property
     def media_title(self) -> str | None:
         """Get the Media Title."""
-        media_info = self._get_media_info()
-        if not media_info:
-            return None
-        if "title" in media_info:
-            return media_info["title"]
-        current_source = self._get_current_playing_device_id()
-        if not current_source or current_source not in self._sources:
-            return None
-        return self._sources[current_source].name
+        return self._get_snapshot().media_title
 
     @property
     def media_content_type(self):
         """Get current content type if available."""
-        current_source = self._get_current_playing_device_id()
-        if not current_source:
-            return None
-        if current_source == self._get_current_video_device_id():
-            return MediaType.VIDEO
-        return MediaType.MUSIC
+        return self._get_snapshot().media_content_type
+
+    @property
+    def media_artist(self) -> str | None:
+        """Get the artist of the current media."""
+        return self._get_snapshot().now_playing.artist
+
+    @property
+    def media_album_name(self) -> str | None:
+        """Get the album of the current media."""
+        return self._get_snapshot().now_playing.album
+
+    @property
+    def media_duration(self) -> float | None:
+        """Get the duration of the current media in seconds."""
+        return self._get_snapshot().now_playing.duration
+
+    @property
+    def media_image_url(self) -> str | None:
+        """Get the artwork of the current media."""
+        return self._get_snapshot().now_playing.image_url
+
+    async def async_get_media_image(self) -> tuple[bytes | None, str | None]:
+        """Serve the artwork of the current media from the shared cache."""
+        if (url := self.media_image_url) is None:
+            return None, None
+        return await self._artwork.async_get(url)
 
     async def async_media_play_pause(self):
         """If possible, toggle the current play/pause state.
@@ -320,7 +568,7 @@ class Control4Room(Control4Entity, MediaPlayerEntity):
         Unfortunately MediaPlayer capabilities are not dynamic,
         so we must determine if play/pause is supported here
         """
-        if self._get_current_source_state():
+        if self._get_snapshot().source_state:
             await super().async_media_play_pause()
 
     @property
@@ -331,28 +579,29 @@ class Control4Room(Control4Entity, MediaPlayerEntity):
     @property
     def volume_level(self):
         """Get the volume level."""
-        return self.coordinator.data[self._idx][CONTROL4_VOLUME_STATE] / 100
+        return self._item_data[CONTROL4_VOLUME_STATE] / 100
 
     @property
     def is_volume_muted(self):
         """Check if the volume is muted."""
-        return bool(self.coordinator.data[self._idx][CONTROL4_MUTED_STATE])
+        return bool(self._item_data[CONTROL4_MUTED_STATE])
 
     async def async_select_source(self, source):
         """Select a new source."""
         for avail_source in self._sources.values():
             if avail_source.name == source:
                 audio_only = _SourceType.VIDEO not in avail_source.source_type
+                room = self._create_api_object()
                 if audio_only:
-                    await self._create_api_object().setAudioSource(avail_source.idx)
+                    command = partial(room.setAudioSource, avail_source.idx)
                 else:
-                    await self._create_api_object().setVideoAndAudioSource(
-                        avail_source.idx
-                    )
+                    command = partial(room.setVideoAndAudioSource, avail_source.idx)
+                # Shares a kind with power off so the latest of the two wins
+                await self._async_send_expecting(
+                    "power", command, {CONTROL4_POWER_STATE: 1}
+                )
                 break
 
-        await self.coordinator.async_request_refresh()
-
     def turn_on(self):
         """Fake turn-on the room.  Actual power on occurs during source select.
 
@@ -365,43 +614,65 @@ class Control4Room(Control4Entity, MediaPlayerEntity):
     async def async_turn_off(self):
         """Turn off the room."""
         self._is_soft_on = False
-        await self._create_api_object().setRoomOff()
-        await self.coordinator.async_request_refresh()
+        await self._async_send_expecting(
+            "power",
+            lambda: self._create_api_object().setRoomOff(),
+            {CONTROL4_POWER_STATE: 0},
+        )
 
     async def async_mute_volume(self, mute):
         """Mute the room."""
-        if mute:
-            await self._create_api_object().setMuteOn()
-        else:
-            await self._create_api_object().setMuteOff()
-        await self.coordinator.async_request_refresh()
+        room = self._create_api_object()
+        await self._async_send_expecting(
+            "mute",
+            room.setMuteOn if mute else room.setMuteOff,
+            {CONTROL4_MUTED_STATE: int(mute)},
+        )
 
     async def async_set_volume_level(self, volume):
-        """Set room volume, 0-1 scale."""
-        await self._create_api_object().setVolume(int(volume * 100))
-        await self.coordinator.async_request_refresh()
+        """Set room volume, 0-1 scale.
+
+        Volume slider drags are coalesced so only the latest level is sent.
+        """
+        await self._async_send_expecting(
+            "volume",
+            lambda: self._create_api_object().setVolume(int(volume * 100)),
+            {CONTROL4_VOLUME_STATE: int(volume * 100)},
+        )
 
     async def async_volume_up(self):
         """Increase the volume by 1."""
-        await self._create_api_object().setIncrementVolume()
-        await self.coordinator.async_request_refresh()
+        volume = self._item_data[CONTROL4_VOLUME_STATE]
+        # Relative steps must all be sent, so they are never coalesced
+        await self._async_send_expecting(
+            None,
+            lambda: self._create_api_object().setIncrementVolume(),
+            {CONTROL4_VOLUME_STATE: min(volume + 1, 100)},
+        )
 
     async def async_volume_down(self):
         """Decrease the volume by 1."""
-        await self._create_api_object().setDecrementVolume()
-        await self.coordinator.async_request_refresh()
+        volume = self._item_data[CONTROL4_VOLUME_STATE]
+        await self._async_send_expecting(
+            None,
+            lambda: self._create_api_object().setDecrementVolume(),
+            {CONTROL4_VOLUME_STATE: max(volume - 1, 0)},
+        )
 
     async def async_media_pause(self):
         """Issue a pause command."""
-        await self._create_api_object().setPause()
-        await self.coordinator.async_request_refresh()
+        await self._commands.async_send(
+            "transport", lambda: self._create_api_object().setPause()
+        )
 
     async def async_media_play(self):
         """Issue a play command."""
-        await self._create_api_object().setPlay()
-        await self.coordinator.async_request_refresh()
+        await self._commands.async_send(
+            "transport", lambda: self._create_api_object().setPlay()
+        )
 
     async def async_media_stop(self):
         """Issue a stop command."""
-        await self._create_api_object().setStop()
-        await self.coordinator.async_request_refresh()
+        await self._commands.async_send(
+            "transport", lambda: self._create_api_object().setStop()
+        )
@@ -0,0 +1,143 @@
+"""Collects performance metrics of the connection to the Control4 director."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Control4LatencyHistogram:
+    """Counts request latencies into fixed buckets."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+
+    def record(self, latency: float) -> None:
+        """Add a latency in seconds."""
+        self.bucket_counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+        self.last = latency
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean latency in seconds."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        bounds = [f"<={bound}s" for bound in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "last": self.last,
+            "mean": self.mean,
+            "max": self.max,
+            "buckets": dict(zip(bounds, self.bucket_counts)),
+        }
+
+
+class Control4Metrics:
+    """Poll, command, request, artwork and token metrics of a config entry.
+
+    Shared by the coordinator, the token manager and the entities of an
+    entry, and read by the diagnostics and the hub sensors.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.setup_timings: dict[str, float] = {}
+        self.poll_latency = Control4LatencyHistogram()
+        self.poll_failures = 0
+        self.director_outages = 0
+        self.last_poll_error: str | None = None
+        self.last_payload_bytes: int | None = None
+        self.total_payload_bytes = 0
+        self.last_items: int | None = None
+        self.last_parse_time: float | None = None
+        self.pushed_updates = 0
+        self.token_refreshes = 0
+        self.command_latency = Control4LatencyHistogram()
+        self.commands: Counter[str] = Counter()
+        self.commands_coalesced: Counter[str] = Counter()
+        self.command_failures: Counter[str] = Counter()
+        self.connection_setup = Control4LatencyHistogram()
+        self.connections_reused = 0
+        self.artwork: Counter[str] = Counter()
+        self.request_queue_depth = 0
+        self.request_queue_max = 0
+        self.requests_queued = 0
+        self.request_wait = Control4LatencyHistogram()
+
+    def record_poll(
+        self, latency: float, payload_bytes: int, items: int, parse_time: float
+    ) -> None:
+        """Record a successful poll of the director variables."""
+        self.poll_latency.record(latency)
+        self.last_payload_bytes = payload_bytes
+        self.total_payload_bytes += payload_bytes
+        self.last_items = items
+        self.last_parse_time = parse_time
+
+    def record_poll_failure(self, error: Exception) -> None:
+        """Record a failed poll."""
+        self.poll_failures += 1
+        self.last_poll_error = f"{type(error).__name__}: {error}"
+
+    def record_command(self, kind: str, latency: float, failed: bool) -> None:
+        """Record a command sent to the director."""
+        self.commands[kind] += 1
+        if failed:
+            self.command_failures[kind] += 1
+        else:
+            self.command_latency.record(latency)
+
+    def record_request_queued(self, queue_depth: int) -> None:
+        """Record a request that waits for the director request scheduler."""
+        self.requests_queued += 1
+        self.request_queue_depth = queue_depth
+        self.request_queue_max = max(self.request_queue_max, queue_depth)
+
+    @property
+    def handshake_time_saved(self) -> float | None:
+        """Return the seconds saved by reusing connections to the director."""
+        if (mean := self.connection_setup.mean) is None:
+            return None
+        return self.connections_reused * mean
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics for diagnostics."""
+        return {
+            "setup_timings": self.setup_timings,
+            "poll_latency": self.poll_latency.as_dict(),
+            "poll_failures": self.poll_failures,
+            "director_outages": self.director_outages,
+            "last_poll_error": self.last_poll_error,
+            "last_payload_bytes": self.last_payload_bytes,
+            "total_payload_bytes": self.total_payload_bytes,
+            "last_items": self.last_items,
+            "last_parse_time": self.last_parse_time,
+            "pushed_updates": self.pushed_updates,
+            "token_refreshes": self.token_refreshes,
+            "command_latency": self.command_latency.as_dict(),
+            "commands": dict(self.commands),
+            "commands_coalesced": dict(self.commands_coalesced),
+            "command_failures": dict(self.command_failures),
+            "connection_setup": self.connection_setup.as_dict(),
+            "connections_reused": self.connections_reused,
+            "handshake_time_saved": self.handshake_time_saved,
+            "artwork": dict(self.artwork),
+            "request_queue_depth": self.request_queue_depth,
+            "request_queue_max": self.request_queue_max,
+            "requests_queued": self.requests_queued,
+            "request_wait": self.request_wait.as_dict(),
+        }
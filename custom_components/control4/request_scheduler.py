@@ -0,0 +1,153 @@
+"""Schedules the requests of a config entry to its Control4 director."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import heapq
+from itertools import count
+from time import monotonic
+from typing import Any
+
+import aiohttp
+from pyControl4.director import C4Director
+
+from .const import (
+    DIRECTOR_MAX_CONNECTIONS,
+    DIRECTOR_REQUEST_BURST,
+    DIRECTOR_REQUEST_RATE,
+)
+from .metrics import Control4Metrics
+
+# Lanes of requests, lower lanes are sent first
+PRIORITY_COMMAND = 0
+PRIORITY_BACKGROUND = 1
+
+
+class Control4RequestScheduler:
+    """Orders and rate limits the requests to a director.
+
+    Requests start right away while fewer than DIRECTOR_MAX_CONNECTIONS are
+    in flight and the token bucket, refilled at DIRECTOR_REQUEST_RATE per
+    second up to DIRECTOR_REQUEST_BURST, has a token left. Otherwise they
+    queue, and commands leave the queue before polls and catalog requests
+    queued earlier. Requests of one lane keep their order.
+    """
+
+    def __init__(self, metrics: Control4Metrics) -> None:
+        """Initialize the request scheduler."""
+        self._metrics = metrics
+        self._tokens = float(DIRECTOR_REQUEST_BURST)
+        self._refilled_at = monotonic()
+        self._active = 0
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @asynccontextmanager
+    async def async_slot(self, priority: int) -> AsyncIterator[None]:
+        """Wait until a request of the given lane may be sent."""
+        if self._queue or not self._try_acquire():
+            await self._async_wait(priority)
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._release_queued()
+
+    async def _async_wait(self, priority: int) -> None:
+        """Queue a request until _release_queued lets it through."""
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._queue, entry)
+        self._metrics.record_request_queued(len(self._queue))
+        queued_at = monotonic()
+        # Without requests in flight only the wakeup releases the queue
+        self._release_queued()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # Still queued unless _release_queued already dropped it
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+            else:
+                # The slot was granted as the request was cancelled
+                self._active -= 1
+            self._release_queued()
+            raise
+        self._metrics.request_wait.record(monotonic() - queued_at)
+
+    def _try_acquire(self) -> bool:
+        """Take a connection and a token if both are available."""
+        now = monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._refilled_at) * DIRECTOR_REQUEST_RATE,
+            DIRECTOR_REQUEST_BURST,
+        )
+        self._refilled_at = now
+        if self._active >= DIRECTOR_MAX_CONNECTIONS or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._active += 1
+        return True
+
+    def _release_queued(self) -> None:
+        """Let queued requests through in lane order while capacity allows."""
+        while self._queue:
+            # Requests cancelled while queued are dropped without a slot
+            if self._queue[0][2].cancelled():
+                heapq.heappop(self._queue)
+                continue
+            if not self._try_acquire():
+                break
+            _, _, future = heapq.heappop(self._queue)
+            future.set_result(None)
+        self._metrics.request_queue_depth = len(self._queue)
+        # Requests waiting on a connection are let through when one is freed
+        if self._queue and self._active < DIRECTOR_MAX_CONNECTIONS:
+            self._async_schedule_wakeup((1 - self._tokens) / DIRECTOR_REQUEST_RATE)
+
+    def _async_schedule_wakeup(self, delay: float) -> None:
+        """Release queued requests once the bucket has a token again."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.get_running_loop().call_later(
+                delay, self._async_wake_up
+            )
+
+    def _async_wake_up(self) -> None:
+        self._wakeup = None
+        self._release_queued()
+
+
+class Control4Director(C4Director):
+    """Director client whose requests go through the entry's scheduler.
+
+    Commands are POST requests and use the command lane, everything else
+    is a poll or a catalog request in the background lane.
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        director_bearer_token: str,
+        session_no_verify_ssl: aiohttp.ClientSession,
+        scheduler: Control4RequestScheduler,
+    ) -> None:
+        """Initialize the director client."""
+        super().__init__(ip, director_bearer_token, session_no_verify_ssl)
+        self._scheduler = scheduler
+
+    async def sendGetRequest(self, uri: str) -> str:
+        """Send a GET request in the background lane."""
+        async with self._scheduler.async_slot(PRIORITY_BACKGROUND):
+            return await super().sendGetRequest(uri)
+
+    async def sendPostRequest(
+        self, uri: str, command: str, params: Any, async_variable: bool = True
+    ) -> str:
+        """Send a command in the command lane."""
+        async with self._scheduler.async_slot(PRIORITY_COMMAND):
+            return await super().sendPostRequest(uri, command, params, async_variable)
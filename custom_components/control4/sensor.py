@@ -0,0 +1,168 @@
+"""Platform for Control4 hub diagnostic sensors."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import CONF_CONTROLLER_UNIQUE_ID, CONF_METRICS, DOMAIN
+from .metrics import Control4Metrics
+
+# Metrics change with every poll, so sensors sample them instead
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class Control4SensorEntityDescription(SensorEntityDescription):
+    """Describes a Control4 hub metric sensor."""
+
+    value_fn: Callable[[Control4Metrics], Any]
+    attributes_fn: Callable[[Control4Metrics], dict[str, Any]] | None = None
+
+
+SENSORS: tuple[Control4SensorEntityDescription, ...] = (
+    Control4SensorEntityDescription(
+        key="poll_latency",
+        name="Poll latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _milliseconds(metrics.poll_latency.last),
+        attributes_fn=lambda metrics: {
+            "mean": _milliseconds(metrics.poll_latency.mean),
+            "max": _milliseconds(metrics.poll_latency.max),
+            "buckets": metrics.poll_latency.as_dict()["buckets"],
+        },
+    ),
+    Control4SensorEntityDescription(
+        key="poll_payload_size",
+        name="Poll payload size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.last_payload_bytes,
+    ),
+    Control4SensorEntityDescription(
+        key="poll_items",
+        name="Polled items",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.last_items,
+    ),
+    Control4SensorEntityDescription(
+        key="poll_parse_time",
+        name="Poll parse time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _milliseconds(metrics.last_parse_time),
+    ),
+    Control4SensorEntityDescription(
+        key="poll_failures",
+        name="Poll failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.poll_failures,
+        attributes_fn=lambda metrics: {
+            "last_error": metrics.last_poll_error,
+            "director_outages": metrics.director_outages,
+        },
+    ),
+    Control4SensorEntityDescription(
+        key="token_refreshes",
+        name="Token refreshes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.token_refreshes,
+    ),
+    Control4SensorEntityDescription(
+        key="commands",
+        name="Commands sent",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.commands.total(),
+        attributes_fn=lambda metrics: {
+            "by_type": dict(metrics.commands),
+            "coalesced": dict(metrics.commands_coalesced),
+            "failed": dict(metrics.command_failures),
+            "mean_latency": _milliseconds(metrics.command_latency.mean),
+        },
+    ),
+    Control4SensorEntityDescription(
+        key="request_queue_depth",
+        name="Request queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.request_queue_depth,
+        attributes_fn=lambda metrics: {
+            "max": metrics.request_queue_max,
+            "queued": metrics.requests_queued,
+            "mean_wait": _milliseconds(metrics.request_wait.mean),
+        },
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up Control4 hub sensors from a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        [
+            Control4HubSensor(
+                entry_data[CONF_METRICS],
+                entry_data[CONF_CONTROLLER_UNIQUE_ID],
+                description,
+            )
+            for description in SENSORS
+        ]
+    )
+
+
+class Control4HubSensor(SensorEntity):
+    """Reports a metric of the connection to the Control4 controller."""
+
+    entity_description: Control4SensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        metrics: Control4Metrics,
+        controller_unique_id: str,
+        description: Control4SensorEntityDescription,
+    ) -> None:
+        """Initialize a hub sensor."""
+        self.entity_description = description
+        self._metrics = metrics
+        self._attr_unique_id = f"{controller_unique_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, controller_unique_id)}
+        )
+
+    @property
+    def native_value(self) -> Any:
+        """Return the current value of the metric."""
+        return self.entity_description.value_fn(self._metrics)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return details of the metric."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self._metrics)
@@ -0,0 +1,84 @@
+"""HTTP session dedicated to the connection to a Control4 director."""
+
+from __future__ import annotations
+
+from time import monotonic
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util import ssl as ssl_util
+
+from .const import DIRECTOR_KEEPALIVE_TIMEOUT, DIRECTOR_MAX_CONNECTIONS
+from .metrics import Control4Metrics
+
+
+def _trace_config(metrics: Control4Metrics) -> aiohttp.TraceConfig:
+    """Return a trace config counting new and reused director connections."""
+
+    async def on_connection_create_start(
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        _params: aiohttp.TraceConnectionCreateStartParams,
+    ) -> None:
+        context.connect_start = monotonic()
+
+    async def on_connection_create_end(
+        _session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        _params: aiohttp.TraceConnectionCreateEndParams,
+    ) -> None:
+        metrics.connection_setup.record(monotonic() - context.connect_start)
+
+    async def on_connection_reuseconn(
+        _session: aiohttp.ClientSession,
+        _context: SimpleNamespace,
+        _params: aiohttp.TraceConnectionReuseconnParams,
+    ) -> None:
+        metrics.connections_reused += 1
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace_config
+
+
+@callback
+def async_create_director_session(
+    hass: HomeAssistant, entry: ConfigEntry, metrics: Control4Metrics
+) -> aiohttp.ClientSession:
+    """Create the HTTP session of a config entry to its director.
+
+    The shared Home Assistant pool is sized for hundreds of hosts and drops
+    idle connections after 15 seconds, so polls every few seconds keep
+    paying for a new TLS handshake with the director. This session keeps a
+    small pool of connections to the one director alive between polls and
+    uses the unverified SSL context Home Assistant creates once, instead of
+    loading a new one. The session closes when the entry unloads.
+    """
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=DIRECTOR_MAX_CONNECTIONS,
+            limit_per_host=DIRECTOR_MAX_CONNECTIONS,
+            keepalive_timeout=DIRECTOR_KEEPALIVE_TIMEOUT,
+            ssl=ssl_util.get_default_no_verify_context(),
+        ),
+        # aiohttp asks for gzip and deflate responses and decompresses them
+        headers={aiohttp.hdrs.USER_AGENT: SERVER_SOFTWARE},
+        trace_configs=[_trace_config(metrics)],
+    )
+
+    async def async_close(*_: Any) -> None:
+        await session.close()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, async_close)
+    )
+    entry.async_on_unload(async_close)
+    return session
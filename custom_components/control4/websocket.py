@@ -0,0 +1,154 @@
+"""Provides push updates from the Control4 director WebSocket for platforms."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+from aiohttp import client_exceptions
+from pyControl4.error_handling import C4Exception
+from pyControl4.websocket import C4Websocket
+from socketio.exceptions import ConnectionError as SocketIOConnectionError
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONF_DIRECTOR_SESSION, CONF_METRICS, DOMAIN
+from .director_utils import Control4VariableCoordinator
+from .metrics import Control4Metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_variable_change(message: dict[str, Any]) -> tuple[str, Any] | None:
+    """Return the variable name and value carried by a director event, if any."""
+    for payload in (message, message.get("data")):
+        if isinstance(payload, dict) and "varName" in payload and "value" in payload:
+            return payload["varName"], payload["value"]
+    return None
+
+
+def _coerce_value(value: Any, previous: Any) -> Any:
+    """Convert a pushed value to the type returned by the variable poll."""
+    if not isinstance(value, str) or previous is None or isinstance(previous, str):
+        return value
+    try:
+        if isinstance(previous, bool | int):
+            return int(value)
+        if isinstance(previous, float):
+            return float(value)
+        if isinstance(previous, dict | list):
+            return json.loads(value)
+    except ValueError:
+        _LOGGER.debug("Could not convert pushed value %s", value)
+    return value
+
+
+class Control4PushUpdater:
+    """Feeds director variable change events into the hub coordinator.
+
+    While the WebSocket is connected the coordinator only polls every
+    PUSH_RECONCILE_INTERVAL seconds to reconcile missed events. When the
+    connection drops it falls back to adaptive polling.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: Control4VariableCoordinator,
+    ) -> None:
+        """Initialize the push updater."""
+        self.hass = hass
+        self.connected = False
+        self._coordinator = coordinator
+        entry_data = hass.data[DOMAIN][entry.entry_id]
+        self._metrics: Control4Metrics = entry_data[CONF_METRICS]
+        self._websocket = C4Websocket(
+            entry.data[CONF_HOST],
+            entry_data[CONF_DIRECTOR_SESSION],
+            connect_callback=self._async_on_connect,
+            disconnect_callback=self._async_on_disconnect,
+        )
+        self._unsub_coordinator = coordinator.async_add_listener(
+            self._async_track_items
+        )
+        # Items polled before push updates were turned on
+        self._async_track_items()
+
+    async def async_connect(self, director_token: str) -> None:
+        """Open (or reopen) the WebSocket using the given director token."""
+        try:
+            await self._websocket.sio_connect(director_token)
+        except (
+            C4Exception,
+            client_exceptions.ClientError,
+            SocketIOConnectionError,
+            TimeoutError,
+        ) as exception:
+            _LOGGER.warning(
+                "Could not connect to the Control4 director WebSocket, falling back"
+                " to polling: %s",
+                exception,
+            )
+            await self._async_on_disconnect()
+
+    async def async_disconnect(self) -> None:
+        """Close the WebSocket."""
+        self._unsub_coordinator()
+        await self._websocket.sio_disconnect()
+        self.connected = False
+
+    @callback
+    def _async_track_items(self) -> None:
+        """Subscribe to events for items that appeared in the coordinator data."""
+        for item_id in self._coordinator.data or {}:
+            if item_id not in self._websocket.item_callbacks:
+                self._websocket.add_item_callback(item_id, self._async_on_item_event)
+
+    async def _async_on_connect(self) -> None:
+        """Slow down polling once pushed events are flowing."""
+        _LOGGER.debug("Control4 director WebSocket connected")
+        self.connected = True
+        self._coordinator.async_set_push_connected(True)
+        # Catch up on anything that changed while disconnected
+        await self._coordinator.async_request_refresh()
+
+    async def _async_on_disconnect(self) -> None:
+        """Restore regular polling while no events are pushed."""
+        if self.connected:
+            _LOGGER.debug("Control4 director WebSocket disconnected")
+        self.connected = False
+        self._coordinator.async_set_push_connected(False)
+        if self._coordinator.data is not None:
+            await self._coordinator.async_request_refresh()
+
+    async def _async_on_item_event(self, item_id: int, message: dict[str, Any]) -> None:
+        """Apply a director event to the coordinator data."""
+        coordinator = self._coordinator
+        if not coordinator.data or item_id not in coordinator.data:
+            return
+        if (change := _parse_variable_change(message)) is None:
+            # Event without a variable payload, let the poll pick it up
+            await coordinator.async_request_refresh()
+            return
+
+        var_name, value = change
+        if not coordinator.is_tracked(item_id, var_name):
+            return
+        item_data = coordinator.data[item_id]
+        value = _coerce_value(value, item_data.get(var_name))
+        if item_data.get(var_name) == value:
+            return
+
+        _LOGGER.debug("Pushed %s=%s for item %s", var_name, value, item_id)
+        self._metrics.pushed_updates += 1
+        data = dict(coordinator.data)
+        data[item_id] = {**item_data, var_name: value}
+        # async_set_updated_data would restart the poll timer and drop
+        # requested refreshes, so busy rooms would keep postponing the
+        # reconciling poll
+        coordinator.data = data
+        coordinator.async_update_listeners()
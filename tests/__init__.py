@@ -0,0 +1 @@
+"""Tests for the Control4 integration."""
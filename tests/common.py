@@ -0,0 +1,40 @@
+"""Helpers for the Control4 integration tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.director_simulator import DirectorSimulator
+from benchmarks.fixtures import FixtureAccount, generate_project
+from benchmarks.run import _Hub
+from custom_components.control4.const import DOMAIN
+
+
+@asynccontextmanager
+async def async_setup_hub(
+    config_dir: Path, rooms: int = 3
+) -> AsyncIterator[tuple[_Hub, DirectorSimulator]]:
+    """Set up the integration on a simulated director with a generated project."""
+    simulator = DirectorSimulator(generate_project(rooms))
+    host = await simulator.async_start()
+    try:
+        with patch(f"custom_components.{DOMAIN}.C4Account", FixtureAccount):
+            hub = _Hub(host, str(config_dir))
+            await hub.async_setup()
+            try:
+                yield hub, simulator
+            finally:
+                await hub.async_stop()
+    finally:
+        await simulator.async_stop()
+
+
+async def async_wait_for(condition: Callable[[], bool], timeout: float = 5) -> None:
+    """Wait until a condition holds, failing the test after the timeout."""
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.02)
@@ -0,0 +1,53 @@
+"""Tests for the Control4 artwork cache."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import Mock
+
+from aiohttp import ClientSession, web
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.control4.artwork import Control4ArtworkCache
+from custom_components.control4.metrics import Control4Metrics
+
+
+async def test_artwork_from_the_director_shares_one_download(tmp_path: Path) -> None:
+    """Test concurrent requests share one download over the director session."""
+    downloads = 0
+
+    async def image(request: web.Request) -> web.Response:
+        nonlocal downloads
+        downloads += 1
+        await asyncio.sleep(0.05)
+        return web.Response(body=b"cover", content_type="image/jpeg")
+
+    app = web.Application()
+    app.router.add_get("/cover.jpg", image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+
+    hass = HomeAssistant(str(tmp_path))
+    metrics = Control4Metrics()
+    other_session = Mock(spec=ClientSession)
+    try:
+        async with ClientSession() as director_session:
+            artwork = Control4ArtworkCache(
+                hass, f"127.0.0.1:{port}", director_session, other_session, metrics
+            )
+            url = f"http://127.0.0.1:{port}/cover.jpg"
+            results = await asyncio.gather(*(artwork.async_get(url) for _ in range(5)))
+            assert results == [(b"cover", "image/jpeg")] * 5
+            assert downloads == 1
+            assert await artwork.async_get(url) == (b"cover", "image/jpeg")
+            assert downloads == 1
+            assert metrics.artwork["miss"] == 1
+            assert metrics.artwork["hit"] == 1
+        other_session.get.assert_not_called()
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,127 @@
+"""Tests for the Control4 command dispatcher and coalescer."""
+
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.control4.commands import (
+    Control4CommandCoalescer,
+    Control4CommandDispatcher,
+)
+from custom_components.control4.metrics import Control4Metrics
+
+
+class _Device:
+    """Records the commands sent to a device and holds them until released."""
+
+    def __init__(self) -> None:
+        """Initialize the device."""
+        self.sent: list[str] = []
+        self.failing: set[str] = set()
+        self.release = asyncio.Event()
+        self.idle_calls = 0
+        self.coalescer = Control4CommandCoalescer(
+            Control4CommandDispatcher(Control4Metrics(), self._async_on_idle)
+        )
+
+    def command(self, name: str):
+        """Return a command that is sent once the device is released."""
+
+        async def send() -> None:
+            self.sent.append(name)
+            await self.release.wait()
+            if name in self.failing:
+                raise ConnectionError(name)
+
+        return send
+
+    def send(self, kind: str | None, name: str) -> asyncio.Task[None]:
+        """Start sending a command through the coalescer."""
+        return asyncio.create_task(self.coalescer.async_send(kind, self.command(name)))
+
+    async def _async_on_idle(self) -> None:
+        self.idle_calls += 1
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_burst_sends_only_the_latest_command() -> None:
+    """Test commands queued behind one in flight collapse to the latest."""
+    device = _Device()
+    tasks = [device.send("level", f"level {level}") for level in range(5)]
+    await _settle()
+    assert device.sent == ["level 0"]
+
+    device.release.set()
+    await asyncio.gather(*tasks)
+    assert device.sent == ["level 0", "level 4"]
+    assert device.coalescer._dispatcher.metrics.commands_coalesced["level"] == 3
+    assert device.idle_calls == 1
+
+
+async def test_commands_without_a_kind_are_all_sent() -> None:
+    """Test commands without a kind are never replaced."""
+    device = _Device()
+    tasks = [device.send(None, f"step {step}") for step in range(3)]
+    await _settle()
+    device.release.set()
+    await asyncio.gather(*tasks)
+    assert sorted(device.sent) == ["step 0", "step 1", "step 2"]
+
+
+async def test_cancelled_caller_does_not_stall_the_kind() -> None:
+    """Test cancelling a replaced caller leaves the others and the kind working."""
+    device = _Device()
+    first = device.send("level", "level 1")
+    await _settle()
+    cancelled = device.send("level", "level 2")
+    waiting = device.send("level", "level 3")
+    await _settle()
+    cancelled.cancel()
+    await _settle()
+
+    device.release.set()
+    await asyncio.gather(first, waiting)
+    assert cancelled.cancelled()
+    assert device.sent == ["level 1", "level 3"]
+
+    await device.send("level", "level 4")
+    assert device.sent[-1] == "level 4"
+
+
+async def test_cancelled_sender_releases_queued_callers() -> None:
+    """Test callers waiting on a cancelled sender are not left hanging."""
+    device = _Device()
+    first = device.send("level", "level 1")
+    await _settle()
+    waiting = device.send("level", "level 2")
+    await _settle()
+    first.cancel()
+    await _settle()
+    device.release.set()
+    await asyncio.wait_for(asyncio.gather(first, waiting, return_exceptions=True), 1)
+
+    await device.send("level", "level 3")
+    assert device.sent[-1] == "level 3"
+
+
+async def test_failures_in_a_burst_reach_their_callers() -> None:
+    """Test a failed command fails its own callers but not the replacement."""
+    device = _Device()
+    device.failing = {"level 1", "level 3"}
+    first = device.send("level", "level 1")
+    await _settle()
+    replaced = device.send("level", "level 2")
+    latest = device.send("level", "level 3")
+    await _settle()
+    device.release.set()
+    results = await asyncio.gather(first, replaced, latest, return_exceptions=True)
+    assert [str(result) for result in results] == ["level 1", "level 3", "level 3"]
+    assert device.sent == ["level 1", "level 3"]
+
+    device.failing = set()
+    await device.send("level", "level 4")
+    assert device.sent[-1] == "level 4"
@@ -0,0 +1,73 @@
+"""Tests for the Control4 config flow."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from pyControl4.director import C4Director
+from pyControl4.error_handling import C4Exception
+
+from custom_components.control4.config_flow import Control4Validator
+
+ACCOUNT_CONTROLLER = "control4_core5_000FFF123456"
+ACCOUNT_MAC = "00:0f:ff:12:34:56"
+OTHER_MAC = "00:0f:ff:65:43:21"
+
+
+def _validator(answers: dict[str, tuple[float, bool]]) -> Control4Validator:
+    """Return a validator whose probes answer after a delay per host."""
+    validator = Control4Validator(None, "user", "password", None)
+    validator.controller_unique_id = ACCOUNT_CONTROLLER
+
+    async def probe(host: str) -> bool:
+        delay, accepted = answers[host]
+        await asyncio.sleep(delay)
+        return accepted
+
+    validator._async_probe = probe
+    return validator
+
+
+async def test_director_of_the_account_is_preferred() -> None:
+    """Test the director with the MAC of the account wins over faster ones."""
+    validator = _validator({"10.0.0.1": (0, True), "10.0.0.2": (0.05, True)})
+    assert await validator.find_director(
+        {"10.0.0.1": OTHER_MAC, "10.0.0.2": ACCOUNT_MAC}
+    )
+    assert validator.host == "10.0.0.2"
+
+
+async def test_first_responder_is_kept_without_a_match() -> None:
+    """Test the first director to answer is kept when none matches the account."""
+    validator = _validator(
+        {"10.0.0.1": (0.05, True), "10.0.0.2": (0, True), "10.0.0.3": (10, True)}
+    )
+    async with asyncio.timeout(1):
+        assert await validator.find_director(
+            {"10.0.0.1": None, "10.0.0.2": OTHER_MAC, "10.0.0.3": None}
+        )
+    assert validator.host == "10.0.0.2"
+
+
+async def test_first_responder_is_kept_when_the_match_fails() -> None:
+    """Test another director is kept when the one of the account rejects the token."""
+    validator = _validator({"10.0.0.1": (0, True), "10.0.0.2": (0.05, False)})
+    assert await validator.find_director({"10.0.0.1": None, "10.0.0.2": ACCOUNT_MAC})
+    assert validator.host == "10.0.0.1"
+
+    validator = _validator({"10.0.0.1": (0, False)})
+    assert not await validator.find_director({"10.0.0.1": ACCOUNT_MAC})
+
+
+async def test_probe_rejects_director_errors() -> None:
+    """Test a director answering with an error is not kept."""
+
+    async def failing_request(director: C4Director, category: str) -> str:
+        raise C4Exception("Internal server error")
+
+    validator = Control4Validator(None, "user", "password", None)
+    with patch(
+        "custom_components.control4.config_flow.aiohttp_client.async_get_clientsession"
+    ), patch.object(C4Director, "getAllItemsByCategory", failing_request):
+        assert not await validator._async_probe("10.0.0.1")
@@ -0,0 +1,204 @@
+"""Tests for the director token, poll coordinator and circuit breaker."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from pathlib import Path
+
+from aiohttp import ClientConnectionError
+from pyControl4.error_handling import C4Exception
+
+from custom_components.control4.const import (
+    CONF_DIRECTOR,
+    CONF_METRICS,
+    CONF_TOKEN_MANAGER,
+    DIRECTOR_MAX_PROBE_INTERVAL,
+    DIRECTOR_OFFLINE_THRESHOLD,
+    DIRECTOR_PROBE_INTERVAL,
+    DOMAIN,
+)
+from custom_components.control4.director_utils import Control4CircuitBreaker
+
+from .common import async_setup_hub
+
+
+def test_breaker_opens_after_consecutive_failures() -> None:
+    """Test the circuit opens on the threshold failure and closes on success."""
+    breaker = Control4CircuitBreaker()
+    opened = [breaker.record_failure() for _ in range(DIRECTOR_OFFLINE_THRESHOLD)]
+    assert opened == [False] * (DIRECTOR_OFFLINE_THRESHOLD - 1) + [True]
+    assert breaker.is_open
+    # Further failures do not open it again
+    assert not breaker.record_failure()
+
+    assert breaker.record_success()
+    assert not breaker.is_open
+    assert not breaker.record_success()
+
+
+def test_breaker_backs_off_up_to_the_maximum() -> None:
+    """Test the probe interval doubles on every failed probe up to the cap."""
+    breaker = Control4CircuitBreaker()
+    for _ in range(DIRECTOR_OFFLINE_THRESHOLD):
+        breaker.record_failure()
+    intervals = []
+    for _ in range(10):
+        intervals.append(breaker.retry_interval().total_seconds())
+        breaker.record_failure()
+    assert intervals[:4] == [
+        DIRECTOR_PROBE_INTERVAL,
+        DIRECTOR_PROBE_INTERVAL * 2,
+        DIRECTOR_PROBE_INTERVAL * 4,
+        DIRECTOR_PROBE_INTERVAL * 8,
+    ]
+    assert intervals[-1] == DIRECTOR_MAX_PROBE_INTERVAL
+    for _ in range(100):
+        breaker.record_failure()
+    assert breaker.retry_interval().total_seconds() == DIRECTOR_MAX_PROBE_INTERVAL
+
+
+async def test_unreachable_director_is_probed_with_backoff(tmp_path: Path) -> None:
+    """Test polls keep stale data, back off and probe until the director answers."""
+    async with async_setup_hub(tmp_path) as (hub, _):
+        coordinator = hub.coordinator
+        director = hub.hass.data[DOMAIN][hub.entry.entry_id][CONF_DIRECTOR]
+        data = coordinator.data
+        requests: list[str] = []
+
+        async def unreachable(uri: str) -> str:
+            requests.append(uri)
+            raise ClientConnectionError("Connection refused")
+
+        director.sendGetRequest = unreachable
+        for _ in range(DIRECTOR_OFFLINE_THRESHOLD):
+            await coordinator.async_refresh()
+        assert coordinator.breaker.is_open
+        assert coordinator.last_update_success
+        assert coordinator.data == data
+        assert coordinator.stale_since is not None
+        assert coordinator.update_interval == timedelta(seconds=DIRECTOR_PROBE_INTERVAL)
+        assert hub.metrics.director_outages == 1
+
+        # An open circuit probes with a small request instead of a full poll
+        requests.clear()
+        await coordinator.async_refresh()
+        assert requests == ["/api/v1/categories/controllers"]
+        assert coordinator.update_interval == timedelta(
+            seconds=DIRECTOR_PROBE_INTERVAL * 2
+        )
+
+        del director.sendGetRequest
+        await coordinator.async_refresh()
+        assert not coordinator.breaker.is_open
+        assert coordinator.stale_since is None
+        assert coordinator.update_interval < timedelta(seconds=DIRECTOR_PROBE_INTERVAL)
+
+
+async def test_concurrent_token_refreshes_share_one_request(tmp_path: Path) -> None:
+    """Test callers refreshing at once share a single token request."""
+    async with async_setup_hub(tmp_path) as (hub, _):
+        token_manager = hub.hass.data[DOMAIN][hub.entry.entry_id][CONF_TOKEN_MANAGER]
+        account = token_manager._account
+        get_director_token = account.getDirectorBearerToken
+        calls = 0
+
+        async def slow_director_token(controller_unique_id: str) -> dict:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return await get_director_token(controller_unique_id)
+
+        account.getDirectorBearerToken = slow_director_token
+        old_token = token_manager.token
+        directors = await asyncio.gather(
+            *(token_manager.async_refresh(old_token) for _ in range(5))
+        )
+        assert calls == 1
+        assert token_manager.token != old_token
+        assert all(director is token_manager.director for director in directors)
+        assert hub.hass.data[DOMAIN][hub.entry.entry_id][CONF_DIRECTOR] is directors[0]
+
+        # Requests rejected with the old token use the refreshed one
+        await token_manager.async_refresh(old_token)
+        assert calls == 1
+        await token_manager.async_refresh()
+        assert calls == 2
+
+
+async def test_failed_token_refresh_is_retried(tmp_path: Path) -> None:
+    """Test a failed refresh is not shared with later callers."""
+    async with async_setup_hub(tmp_path) as (hub, _):
+        token_manager = hub.hass.data[DOMAIN][hub.entry.entry_id][CONF_TOKEN_MANAGER]
+        account = token_manager._account
+        get_director_token = account.getDirectorBearerToken
+        failures = [C4Exception("Account API unavailable")]
+
+        async def flaky_director_token(controller_unique_id: str) -> dict:
+            if failures:
+                raise failures.pop()
+            return await get_director_token(controller_unique_id)
+
+        account.getDirectorBearerToken = flaky_director_token
+        old_token = token_manager.token
+        try:
+            await token_manager.async_refresh()
+        except C4Exception:
+            pass
+        else:
+            raise AssertionError("The refresh did not fail")
+        assert token_manager.token == old_token
+
+        await token_manager.async_refresh()
+        assert token_manager.token != old_token
+
+
+async def test_expired_token_is_refreshed_by_a_poll(tmp_path: Path) -> None:
+    """Test a poll rejected for an expired token refreshes it and retries."""
+    async with async_setup_hub(tmp_path) as (hub, simulator):
+        simulator.expire_tokens()
+        await hub.coordinator.async_refresh()
+        assert hub.coordinator.last_update_success
+        metrics = hub.hass.data[DOMAIN][hub.entry.entry_id][CONF_METRICS]
+        assert metrics.token_refreshes == 1
+
+
+async def test_sub_second_polls_are_spaced_out(tmp_path: Path) -> None:
+    """Test fast polls keep their interval instead of running back to back.
+
+    Scheduling them relies on private attributes of DataUpdateCoordinator,
+    so this pins the behavior to the installed Home Assistant.
+    """
+    async with async_setup_hub(tmp_path) as (hub, simulator):
+        coordinator = hub.coordinator
+        loop = hub.hass.loop
+        coordinator.async_set_poll_phase(0.9)
+        await coordinator.async_set_intervals(0.25, 30, 300)
+        coordinator.async_note_activity()
+        await hub.hass.async_block_till_done()
+        assert coordinator.update_interval == timedelta(seconds=0.25)
+
+        for _ in range(4):
+            coordinator._schedule_refresh()
+            now = loop.time()
+            next_poll = coordinator._unsub_refresh.__self__.when()
+            assert now < next_poll <= now + 0.25
+            assert round((next_poll - 0.9) / 0.25, 6) % 1 == 0
+            await asyncio.sleep(0.1)
+
+        polls = simulator.requests["GET /api/v1/items/variables"]
+        await asyncio.sleep(1.5)
+        assert 4 <= simulator.requests["GET /api/v1/items/variables"] - polls <= 8
+
+
+async def test_polls_run_at_the_poll_phase(tmp_path: Path) -> None:
+    """Test polls of whole seconds start at the phase given to the coordinator."""
+    async with async_setup_hub(tmp_path) as (hub, _):
+        coordinator = hub.coordinator
+        coordinator.async_set_poll_phase(0.3)
+        await coordinator.async_set_intervals(30, 30, 300)
+        await hub.hass.async_block_till_done()
+
+        coordinator._schedule_refresh()
+        next_poll = coordinator._unsub_refresh.__self__.when()
+        assert round(next_poll % 1, 6) == 0.3
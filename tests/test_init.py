@@ -0,0 +1,82 @@
+"""Tests for the Control4 entities and their catalog reconciliation."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from pathlib import Path
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from custom_components.control4.catalog import Control4Catalog
+from custom_components.control4.const import DOMAIN, SIGNAL_CATALOG_UPDATED
+
+from .common import async_setup_hub
+
+NEW_ROOM_ID = 99999
+
+
+async def test_catalog_update_adds_removes_and_renames(tmp_path: Path) -> None:
+    """Test a changed project is applied to the entities without a reload."""
+    async with async_setup_hub(tmp_path) as (hub, simulator):
+        hass = hub.hass
+        entity_registry = er.async_get(hass)
+        project = simulator._project
+        items = deepcopy(project.items)
+        ui_configuration = deepcopy(project.ui_configuration)
+
+        lights = hub.entities("light")
+        removed, renamed = lights[0], lights[1]
+        items = [item for item in items if item["id"] != removed._idx]
+        next(item for item in items if item["id"] == renamed._idx)["name"] = "Lamp"
+        floor = next(item for item in items if item["typeName"] == "floor")
+        items.append(
+            {
+                "id": NEW_ROOM_ID,
+                "typeName": "room",
+                "name": "Cinema",
+                "parentId": floor["id"],
+            }
+        )
+        ui_configuration["experiences"].append(
+            {
+                "type": "watch",
+                "room_id": NEW_ROOM_ID,
+                "sources": {
+                    "source": ui_configuration["experiences"][0]["sources"]["source"]
+                },
+            }
+        )
+
+        async_dispatcher_send(
+            hass,
+            SIGNAL_CATALOG_UPDATED.format(hub.entry.entry_id),
+            Control4Catalog(items, ui_configuration),
+        )
+        await hass.async_block_till_done()
+
+        assert (
+            entity_registry.async_get_entity_id("light", DOMAIN, str(removed._idx))
+            is None
+        )
+        assert hass.states.get(removed.entity_id) is None
+
+        renamed_state = hass.states.get(renamed.entity_id)
+        assert renamed_state.name.endswith("Lamp")
+
+        # The director does not report the new room yet
+        room_id = entity_registry.async_get_entity_id(
+            "media_player", DOMAIN, str(NEW_ROOM_ID)
+        )
+        assert room_id is not None
+        assert hass.states.get(room_id).state == STATE_UNAVAILABLE
+
+        # The next poll picks the room up once the director reports it
+        for var_name, value in simulator.variables(
+            hub.entities("media_player")[0]._idx
+        ).items():
+            simulator.set_variable(NEW_ROOM_ID, var_name, value)
+        await hub.coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert hass.states.get(room_id).state != STATE_UNAVAILABLE
@@ -0,0 +1,33 @@
+"""Tests for the Control4 room media players."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from homeassistant.components.media_player import MediaPlayerState
+
+from .common import async_setup_hub
+
+
+async def test_turn_off_is_confirmed_by_the_power_state(tmp_path: Path) -> None:
+    """Test turning off a room ignores the media info the director keeps."""
+    async with async_setup_hub(tmp_path) as (hub, simulator):
+        hass = hub.hass
+        room = hub.entities("media_player")[0]
+        await room.async_select_source(room.source_list[0])
+        await hub.coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert room.state == MediaPlayerState.PLAYING
+        stale_media_info = simulator.variables(room._idx)["CURRENT MEDIA INFO"]
+
+        await room.async_turn_off()
+        assert hass.states.get(room.entity_id).state == MediaPlayerState.OFF
+        assert room.media_title is None
+
+        for media_info in (stale_media_info, ""):
+            simulator.set_variable(room._idx, "CURRENT MEDIA INFO", media_info)
+            await hub.coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert not room._pending
+            assert hass.states.get(room.entity_id).state == MediaPlayerState.OFF
+            assert room.media_title is None
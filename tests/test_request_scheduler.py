@@ -0,0 +1,139 @@
+"""Tests for the request scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+
+from custom_components.control4.const import (
+    DIRECTOR_MAX_CONNECTIONS,
+    DIRECTOR_REQUEST_BURST,
+    DIRECTOR_REQUEST_RATE,
+)
+from custom_components.control4.metrics import Control4Metrics
+from custom_components.control4.request_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    Control4RequestScheduler,
+)
+
+
+class _Requests:
+    """Requests that hold their slot until released one by one."""
+
+    def __init__(self, scheduler: Control4RequestScheduler) -> None:
+        self.scheduler = scheduler
+        self.started: list[str] = []
+        self._release = asyncio.Semaphore(0)
+        self.tasks: list[asyncio.Task[None]] = []
+
+    def start(self, name: str, priority: int = PRIORITY_BACKGROUND) -> None:
+        self.tasks.append(asyncio.create_task(self._request(name, priority)))
+
+    async def _request(self, name: str, priority: int) -> None:
+        async with self.scheduler.async_slot(priority):
+            self.started.append(name)
+            await self._release.acquire()
+
+    def release(self, count: int = 1) -> None:
+        for _ in range(count):
+            self._release.release()
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_requests_within_the_burst_are_not_queued() -> None:
+    """Test requests start right away while tokens and connections are left."""
+    metrics = Control4Metrics()
+    scheduler = Control4RequestScheduler(metrics)
+    for _ in range(DIRECTOR_REQUEST_BURST):
+        async with scheduler.async_slot(PRIORITY_BACKGROUND):
+            pass
+    assert metrics.requests_queued == 0
+
+
+async def test_requests_wait_for_a_free_connection() -> None:
+    """Test no more than DIRECTOR_MAX_CONNECTIONS requests are in flight."""
+    metrics = Control4Metrics()
+    requests = _Requests(Control4RequestScheduler(metrics))
+    for index in range(DIRECTOR_MAX_CONNECTIONS + 1):
+        requests.start(f"poll {index}")
+    await _settle()
+    assert len(requests.started) == DIRECTOR_MAX_CONNECTIONS
+    assert metrics.request_queue_depth == 1
+
+    requests.release()
+    await _settle()
+    assert len(requests.started) == DIRECTOR_MAX_CONNECTIONS + 1
+    assert metrics.request_queue_depth == 0
+    requests.release(DIRECTOR_MAX_CONNECTIONS)
+    await asyncio.gather(*requests.tasks)
+
+
+async def test_commands_leave_the_queue_before_polls() -> None:
+    """Test a queued command is sent before polls queued earlier."""
+    requests = _Requests(Control4RequestScheduler(Control4Metrics()))
+    for index in range(DIRECTOR_MAX_CONNECTIONS):
+        requests.start(f"poll {index}")
+    await _settle()
+    requests.start("queued poll")
+    await _settle()
+    requests.start("command", PRIORITY_COMMAND)
+    await _settle()
+
+    requests.release()
+    await _settle()
+    assert requests.started[DIRECTOR_MAX_CONNECTIONS:] == ["command"]
+    requests.release()
+    await _settle()
+    assert requests.started[DIRECTOR_MAX_CONNECTIONS:] == ["command", "queued poll"]
+    requests.release(DIRECTOR_MAX_CONNECTIONS)
+    await asyncio.gather(*requests.tasks)
+
+
+async def test_rate_limited_request_is_released_without_requests_in_flight() -> None:
+    """Test a request waiting for a token is woken once the bucket refills."""
+    metrics = Control4Metrics()
+    scheduler = Control4RequestScheduler(metrics)
+    for _ in range(DIRECTOR_REQUEST_BURST):
+        async with scheduler.async_slot(PRIORITY_BACKGROUND):
+            pass
+
+    start = monotonic()
+    async with asyncio.timeout(1):
+        async with scheduler.async_slot(PRIORITY_BACKGROUND):
+            pass
+    assert metrics.requests_queued == 1
+    assert monotonic() - start >= 0.5 / DIRECTOR_REQUEST_RATE
+
+
+async def test_cancelled_queued_request_does_not_keep_a_connection() -> None:
+    """Test cancelling a queued request leaves every connection usable."""
+    metrics = Control4Metrics()
+    scheduler = Control4RequestScheduler(metrics)
+    requests = _Requests(scheduler)
+    for index in range(DIRECTOR_MAX_CONNECTIONS):
+        requests.start(f"poll {index}")
+    await _settle()
+    requests.start("cancelled")
+    await _settle()
+    cancelled = requests.tasks.pop()
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    requests.release(DIRECTOR_MAX_CONNECTIONS)
+    await asyncio.gather(*requests.tasks)
+    assert "cancelled" not in requests.started
+    assert metrics.request_queue_depth == 0
+
+    # Every connection is free again
+    requests = _Requests(scheduler)
+    for index in range(DIRECTOR_MAX_CONNECTIONS):
+        requests.start(f"poll {index}")
+    async with asyncio.timeout(1):
+        while len(requests.started) < DIRECTOR_MAX_CONNECTIONS:
+            await asyncio.sleep(0.01)
+    requests.release(DIRECTOR_MAX_CONNECTIONS)
+    await asyncio.gather(*requests.tasks)
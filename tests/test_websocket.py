@@ -0,0 +1,70 @@
+"""Tests for the Control4 push updates."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from custom_components.control4.const import (
+    CONF_PUSH_UPDATES,
+    CONF_WEBSOCKET,
+    DOMAIN,
+)
+from custom_components.control4.websocket import (
+    _coerce_value,
+    _parse_variable_change,
+)
+
+from .common import async_setup_hub, async_wait_for
+
+
+def test_parse_variable_change() -> None:
+    """Test variable changes are read from both event layouts."""
+    assert _parse_variable_change({"varName": "LIGHT_LEVEL", "value": "40"}) == (
+        "LIGHT_LEVEL",
+        "40",
+    )
+    assert _parse_variable_change(
+        {"evtName": "OnDataToUI", "data": {"varName": "POWER_STATE", "value": "1"}}
+    ) == ("POWER_STATE", "1")
+    assert _parse_variable_change({"evtName": "OnDataToUI", "data": "ping"}) is None
+    assert _parse_variable_change({"varName": "LIGHT_LEVEL"}) is None
+
+
+def test_coerce_value_matches_the_polled_type() -> None:
+    """Test pushed strings are converted to the type of the polled value."""
+    assert _coerce_value("40", 10) == 40
+    assert _coerce_value("1", False) == 1
+    assert _coerce_value("21.5", 20.0) == 21.5
+    assert _coerce_value('{"title": "Song"}', {}) == {"title": "Song"}
+    assert _coerce_value("", "Title") == ""
+    assert _coerce_value("40", None) == "40"
+    assert _coerce_value("loud", 10) == "loud"
+
+
+async def test_pushed_values_update_state_without_polling(tmp_path: Path) -> None:
+    """Test pushed values update entities and keep the reconciling poll."""
+    async with async_setup_hub(tmp_path) as (hub, simulator):
+        hass, coordinator = hub.hass, hub.coordinator
+        hass.config_entries.async_update_entry(
+            hub.entry, options={**hub.entry.options, CONF_PUSH_UPDATES: True}
+        )
+        entry_data = hass.data[DOMAIN][hub.entry.entry_id]
+        await async_wait_for(
+            lambda: CONF_WEBSOCKET in entry_data
+            and entry_data[CONF_WEBSOCKET].connected
+            and simulator._subscriptions
+        )
+        await hass.async_block_till_done()
+
+        light = next(light for light in hub.entities("light") if light._is_dimmer)
+        timer = coordinator._unsub_refresh
+        polls = simulator.requests["GET /api/v1/items/variables"]
+        simulator.set_variable(light._idx, "LIGHT_LEVEL", 40)
+        await async_wait_for(
+            lambda: hass.states.get(light.entity_id).attributes.get("brightness")
+            == round(40 * 255 / 100)
+        )
+        assert coordinator.data[light._idx]["LIGHT_LEVEL"] == 40
+        assert hub.metrics.pushed_updates == 1
+        assert simulator.requests["GET /api/v1/items/variables"] == polls
+        assert coordinator._unsub_refresh is timer